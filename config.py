@@ -1,5 +1,5 @@
 import os
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from web_test import assist
 
@@ -60,6 +60,39 @@ class Settings(pydantic.BaseSettings):
 
     base_url: str = ''
     timeout: float = 6.0
+    wait_engine: Literal['polling', 'observer'] = 'polling'
+    """
+    'observer' to wait for common conditions in the browser via MutationObserver,
+    instead of polling them over WebDriver, see web_test.assist.selene.observer
+    """
+    fused_commands: bool = False
+    """
+    perform chains like fused(element).should(be.enabled).click() in one wait loop,
+    see web_test.assist.selene.fusion
+    """
+    element_handle_cache: bool = False
+    """
+    reuse found web elements of named elements of page models until they are stale,
+    see web_test.assist.selene.handles
+    """
+    browser_state_snapshots: bool = False
+    """
+    restore the browser state captured after named setup flows like BasePage.open_after
+    instead of performing them again, see web_test.assist.selene.state
+    """
+    step_param_max_length: int = 200
+    """
+    truncate params of report.step steps longer than this
+    """
+    step_param_attach_longer_than: Optional[int] = None
+    """
+    attach truncated step params in full if longer than this, None to never attach them
+    """
+    step_coalesce_min_run: Optional[int] = None
+    """
+    merge runs of at least this many alike passed sibling steps into one step in reports,
+    None to keep all steps, see web_test.assist.allure.coalescing
+    """
     browser_name: supported.BrowserName = 'chrome'                              # todo: consider renaming to browserName for consistency with capability
     headless: bool = False
     window_width: int = 1440
@@ -82,10 +115,101 @@ class Settings(pydantic.BaseSettings):
     """
     named not in snake_case for consistency with original capability name
     """
+    remote_keep_alive: bool = True
+    """
+    reuse http connections to remote_url between commands and drivers
+    """
+    remote_connection_pool_size: int = 10
+    remote_command_timeout: float = 120.0
+    """
+    seconds to wait for the response to one remote command
+    """
+    remote_connect_retries: int = 3
+    """
+    how many times to retry connecting to remote_url,
+    and idempotent commands answered with 502/503/504
+    """
+    remote_retry_backoff: float = 0.5
     hold_browser_open: bool = False
     save_page_source_on_failure: bool = True
     author: str = 'yashaka'
     chromedriver_path: Optional[str] = None
+    fast_profile: bool = False
+    """
+    loads pages faster by not waiting for all resources (pageLoadStrategy=eager),
+    disabling images, extensions and background networking,
+    reusing disk cache between tests of the same worker,
+    and blocking blocked_urls (only for local chromium based browsers)
+    """
+    blocked_urls: List[str] = [
+        '*google-analytics.com*',
+        '*googletagmanager.com*',
+        '*doubleclick.net*',
+        '*googlesyndication.com*',
+        '*facebook.net*',
+        '*fonts.googleapis.com*',
+        '*fonts.gstatic.com*',
+        '*.woff',
+        '*.woff2',
+    ]
+    """
+    url patterns (with * wildcards) to block if fast_profile is on
+    """
+    mirror: assist.mirror.Mode = 'off'
+    """
+    'replay' to run tests offline against pages recorded in mirror_dir,
+    'record' to record pages that are not there yet,
+    'off' to use original pages
+    """
+    mirror_dir: str = 'etc/mirror'
+    impact: assist.impact.Mode = 'off'
+    """
+    'record' to save which project code each run test executed into impact_index,
+    'select' to run only tests affected by changes since the recorded run (plus smoke ones),
+    see web_test.assist.impact for more details
+    """
+    impact_index: str = 'etc/impact/index.json'
+    reruns_budget: int = 10
+    """
+    max number of reruns of tests marked by mark.flaky in the whole session
+    """
+    reruns_breaker_window: int = 20
+    reruns_breaker_failure_rate: float = 0.5
+    """
+    stop rerunning while this part of the last reruns_breaker_window test attempts failed
+    """
+    reruns_reuse_session: bool = False
+    """
+    rerun failed tests in the browser kept from a passed test instead of a new one
+    """
+    reruns_stats: str = 'etc/flaky/stats.json'
+    memory_aware_workers: bool = False
+    """
+    size `-n auto` workers and throttle starting browsers by available memory,
+    see web_test.assist.memory for more details
+    """
+    memory_browser_rss_mb: float = 500
+    """
+    expected memory of one browser until it is measured
+    """
+    memory_headroom_mb: float = 1024
+    """
+    memory to keep available for everything else
+    """
+    memory_recycle_rss_mb: float = 1500
+    """
+    quit the browser that outgrew this memory instead of reusing it
+    """
+    memory_stats: str = 'etc/memory/stats.json'
+    deadline_test_seconds: Optional[float] = None
+    """
+    fail fast the test that ran out of this time, shortening its waits to what is left,
+    None to not limit tests unless marked by mark.deadline, see web_test.assist.deadlines
+    """
+    deadline_suite_seconds: Optional[float] = None
+    """
+    fail fast the rest of the session (of each xdist worker) after this time, None to not limit it
+    """
 
     @classmethod
     def in_context(cls, env: Optional[EnvContext] = None) -> 'Settings':
@@ -0,0 +1,3 @@
+#!/bin/bash
+
+python -m web_test.assist.allure.packs compact reports reports.packed "${@:1}"
\ No newline at end of file
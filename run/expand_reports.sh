@@ -0,0 +1,3 @@
+#!/bin/bash
+
+python -m web_test.assist.allure.packs expand reports.packed reports "${@:1}"
\ No newline at end of file
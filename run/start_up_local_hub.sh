@@ -0,0 +1,3 @@
+#!/bin/bash
+
+python -m web_test.assist.selenium.hub "${@:1}"
@@ -0,0 +1,3 @@
+#!/bin/bash
+
+env -S "impact=select" pytest tests --alluredir=reports "${@:1}"
\ No newline at end of file
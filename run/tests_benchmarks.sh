@@ -0,0 +1,3 @@
+#!/bin/bash
+
+pytest tests --alluredir=reports -m benchmark "${@:1}"
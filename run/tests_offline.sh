@@ -0,0 +1,3 @@
+#!/bin/bash
+
+env -S "mirror=replay" pytest tests --alluredir=reports "${@:1}"
@@ -0,0 +1,3 @@
+#!/bin/bash
+
+env -S "memory_aware_workers=True" pytest tests -n auto --alluredir=reports "${@:1}"
\ No newline at end of file
@@ -0,0 +1,3 @@
+#!/bin/bash
+
+env -S "impact=record" pytest tests --alluredir=reports "${@:1}"
\ No newline at end of file
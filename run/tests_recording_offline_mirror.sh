@@ -0,0 +1,3 @@
+#!/bin/bash
+
+env -S "mirror=record" pytest tests --alluredir=reports "${@:1}"
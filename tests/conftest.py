@@ -1,35 +1,104 @@
+import contextvars
+import functools
+import os
 import re
-from typing import Self
+from typing import Optional, Self
 
 import allure_commons
 import pytest
 import allure
-from selene import Collection, Element, browser
+from selene import Collection, Element
 from selene.core.entity import Browser, WaitingEntity
 from selene.core.locator import Locator
+from selene.common.helpers import to_by
 
 import web_test
-from selene.support.shared import browser
+from web_test.assist.selene.context import browser
 from selene import support
 from web_test import assist
 from web_test.assist.allure import report
-from web_test.assist.python import monkey
-from web_test.assist.selene.report import wait_with
+from web_test.assist.python import etc, monkey
+from web_test.assist.selene.report import polling, wait_with
+
+_last_locator_pattern = re.compile(r"""(element|all)\(\('[^()]*', '[^']*'\)\)$""")
 
 
 @pytest.fixture(scope="session", autouse=True)
 def add_reporting_to_selene_steps():
     original_open = Browser.open
 
+    @functools.wraps(original_open)
+    def mirrored_open(self, relative_or_absolute_url: str):
+        assist.selene.handles.navigated()
+        return original_open(self, assist.mirror.url(relative_or_absolute_url))
+
     @monkey.patch_method_in(Browser)
     def open(self, relative_or_absolute_url: str):
-        return report.step(original_open)(self, relative_or_absolute_url)
+        return report.step(mirrored_open)(self, relative_or_absolute_url)
 
     # we need the last part of the locator for use as a name in case a description wasn't provided
+    # so we store it on the locator at the moment the element is built,
+    # and also link the built element to the one it was derived from, if the latter is described,
+    # to preserve the naming chain for elements like `page.modal.footer.element(by.text("Close"))`,
+    # the entity and the way the built one was derived from it are stored too,
+    # so it can be found again in the browser itself (see web_test.assist.selene.observer)
+    Locator.last_segment = None
+    Locator.derived_from = None
+
+    def chaining(build, last_segment_from):
+        def build_chained(self, *args, **kwargs):
+            entity = build(self, *args, **kwargs)
+            if self.description or self.previous_name_chain_element is not None:
+                entity.previous_name_chain_element = self
+            last_segment = last_segment_from(*args, **kwargs)
+            if last_segment:
+                entity._locator.last_segment = last_segment
+            if not kwargs:
+                entity._locator.derived_from = (self, build.__name__, args)
+            return entity
+
+        return build_chained
+
+    def selector_segment(kind):
+        def segment(css_or_xpath_or_by):
+            if isinstance(css_or_xpath_or_by, Locator):
+                return None
+            return f'{kind}({to_by(css_or_xpath_or_by)})'
+
+        return segment
+
+    def selector_and_condition_segment(kind):
+        def segment(selector, condition):
+            return f'{kind}({selector if callable(selector) else to_by(selector)}, {condition})'
+
+        return segment
+
+    for entity_class in (Browser, Element, Collection):
+        entity_class.all = chaining(entity_class.all, selector_segment('all'))
+    for entity_class in (Browser, Element):
+        entity_class.element = chaining(entity_class.element, selector_segment('element'))
+    Collection.all_first = chaining(Collection.all_first, selector_segment('all_first'))
+    Collection.element = chaining(Collection.element, lambda index: f'[{index}]')
+    Collection.sliced = chaining(
+        Collection.sliced,
+        lambda start=None, stop=None, step=1: (
+            f'[{start or ""}:{stop or ""}{":" + str(step) if step not in (None, 1) else ""}]'
+        ),
+    )
+    Collection.by = chaining(Collection.by, lambda condition: f'by({condition})')
+    Collection.by_their = chaining(Collection.by_their, selector_and_condition_segment('by_their'))
+    Collection.element_by = chaining(Collection.element_by, lambda condition: f'element_by({condition})')
+    Collection.element_by_its = chaining(
+        Collection.element_by_its, selector_and_condition_segment('element_by_its')
+    )
+
+    # ... and parse the full description only for locators built in some other way
     @monkey.patch_method_in(Locator)
     def last_locator(self):
-        result = re.search(r"""(element|all)\(\('[^()]*', '[^']*'\)\)$""", self._description)
-        return result.group()
+        if self.last_segment is None:
+            result = _last_locator_pattern.search(self._description)
+            self.last_segment = result.group() if result else self._description
+        return self.last_segment
 
     WaitingEntity.description = ""
     WaitingEntity.previous_name_chain_element = None
@@ -42,7 +111,7 @@ def add_reporting_to_selene_steps():
 
     @property
     def full_description(self):
-        if self.description:
+        if self.description or self.previous_name_chain_element is not None:
             result = self.get_full_path()
         else:
             result = str(self._locator)
@@ -58,11 +127,16 @@ def add_reporting_to_selene_steps():
 
     @monkey.patch_method_in(WaitingEntity)
     def resolve_name(self) -> list:
-        if self.previous_name_chain_element:
+        if self.previous_name_chain_element is not None:
             name = self.previous_name_chain_element.resolve_name()
         else:
             name = []
-        name.append(str(self.description or str(self.last_locator())))
+        part = str(self.description or self._locator.last_locator())
+        if name and part.startswith('['):
+            # an indexed or sliced element reads better without a dot, like `rows[0]`
+            name[-1] += part
+        else:
+            name.append(part)
         return name
 
     @monkey.patch_method_in(WaitingEntity)
@@ -70,12 +144,127 @@ def add_reporting_to_selene_steps():
         self.previous_name_chain_element = previous_element
         return self
 
+    # found elements of named elements may be cached, see web_test.assist.selene.handles
+    original_locate = Element.locate
+
+    @monkey.patch_method_in(Element)
+    def locate(self):
+        return assist.selene.handles.located(self, original_locate)
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    skips tests with empty bodies as pending ones, before any of their fixtures is set up,
+    and deselects benchmarks unless tests are asked for explicitly,
+    via `-m` (like `-m benchmark`), or by their node ids or files (like `pytest tests/test_x_benchmark.py`)
+    """
+    for item in items:
+        if isinstance(item, pytest.Function) and etc.has_empty_body(item.function):
+            item.add_marker(pytest.mark.skip(reason='as pending'))
+
+    asked_for_explicitly = config.option.markexpr or any(
+        '::' in arg or os.path.isfile(arg) for arg in config.args
+    )
+    if not asked_for_explicitly:
+        benchmarks = [item for item in items if item.get_closest_marker('benchmark') is not None]
+        if benchmarks:
+            config.hook.pytest_deselected(items=benchmarks)
+            items[:] = [item for item in items if item.get_closest_marker('benchmark') is None]
+
 
 import config
 
 
+def pytest_configure(config: pytest.Config):
+    """
+    configures limits of step params, and coalescing of alike steps if enabled,
+    registers the test impact plugin if enabled via config.settings.impact,
+    the controller of flaky tests reruns, and deadlines of tests
+    """
+    from config import settings
+
+    report.max_param_length = settings.step_param_max_length
+    report.attach_params_longer_than = settings.step_param_attach_longer_than
+    if settings.step_coalesce_min_run and not allure_commons.plugin_manager.get_plugin('coalescer'):
+        allure_commons.plugin_manager.register(
+            assist.allure.coalescing.Coalescer(settings.step_coalesce_min_run), 'coalescer'
+        )
+
+    if settings.impact != 'off':
+        config.pluginmanager.register(
+            assist.impact.Plugin(
+                settings.impact,
+                web_test.assist.project.abs_path_from_project(settings.impact_index),
+                config.rootpath,
+            ),
+            'impact',
+        )
+
+    controller = assist.reruns.Controller(
+        budget=settings.reruns_budget,
+        breaker_window=settings.reruns_breaker_window,
+        breaker_failure_rate=settings.reruns_breaker_failure_rate,
+        reuse_session=settings.reruns_reuse_session,
+        stats=web_test.assist.project.abs_path_from_project(settings.reruns_stats),
+    )
+    config.pluginmanager.register(controller, 'reruns')
+    assist.reruns.activate(controller)
+
+    assist.memory.activate(_memory_autoscaler(config))
+
+    deadlines = assist.deadlines.Deadlines(
+        test_seconds=settings.deadline_test_seconds,
+        suite_seconds=settings.deadline_suite_seconds,
+    )
+    config.pluginmanager.register(deadlines, 'deadlines')
+    assist.deadlines.activate(deadlines)
+
+
+def _memory_autoscaler(config: pytest.Config) -> Optional[assist.memory.Autoscaler]:
+    """
+    registers the memory autoscaler once if enabled via config.settings.memory_aware_workers
+    """
+    from config import settings
+
+    if not settings.memory_aware_workers:
+        return None
+    autoscaler = config.pluginmanager.get_plugin('memory')
+    if autoscaler is None:
+        autoscaler = assist.memory.Autoscaler(
+            browser_name=settings.browser_name,
+            browser_rss_mb=settings.memory_browser_rss_mb,
+            headroom_mb=settings.memory_headroom_mb,
+            recycle_rss_mb=settings.memory_recycle_rss_mb,
+            stats=web_test.assist.project.abs_path_from_project(settings.memory_stats),
+        )
+        config.pluginmanager.register(autoscaler, 'memory')
+    return autoscaler
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config: pytest.Config) -> Optional[int]:
+    """
+    sizes `-n auto` workers by available memory if enabled, otherwise leaves it to xdist
+    """
+    autoscaler = _memory_autoscaler(config)
+    return autoscaler.workers(os.cpu_count() or 1) if autoscaler else None
+
+
+@pytest.fixture(scope='session', autouse=True)
+def mirror_management():
+    """
+    serves pages recorded by the local mirror if enabled via config.settings.mirror,
+    see web_test.assist.mirror for more details
+    """
+    with assist.mirror.serving(
+        web_test.assist.project.abs_path_from_project(config.settings.mirror_dir),
+        config.settings.mirror,
+    ):
+        yield
+
+
 @pytest.fixture(scope='function', autouse=True)
-def browser_management():
+def browser_management(request):
     """
     Here, before yield,
     goes all "setup" code for each test case
@@ -84,32 +273,61 @@ def browser_management():
 
     import config
 
-    browser.config.base_url = config.settings.base_url
+    browser.config.base_url = assist.mirror.url(config.settings.base_url)
     browser.config.timeout = config.settings.timeout
     browser.config.save_page_source_on_failure = (
         config.settings.save_page_source_on_failure
     )
     browser.config._wait_decorator = wait_with(
-        context=allure_commons._allure.StepContext
+        context=allure_commons._allure.StepContext,
+        engine=(
+            assist.selene.observer.engine
+            if config.settings.wait_engine == 'observer'
+            else polling
+        ),
+        deadline=assist.deadlines.waiting,
     )
 
-    browser.config.driver = _driver_from(config.settings)
+    assist.selene.fusion.enabled = config.settings.fused_commands
+    assist.selene.state.enabled = config.settings.browser_state_snapshots
+
+    browser.config.build_driver_strategy = lambda _: assist.memory.starting(
+        lambda: _driver_from(config.settings)
+    )
+    browser.config.driver = assist.reruns.take(request.node) or ...
+    """
+    the driver will be built on first access to it, e.g. on browser.open,
+    so tests that don't use browser will not even start it,
+    unless it is a rerun that reuses the browser of a passed test
+    """
     browser.config.hold_browser_open = config.settings.hold_browser_open
     """
     TODO: do we even need it? below we quit it manually....
     """
 
-    yield
+    with assist.selene.handles.caching(config.settings.element_handle_cache) as handles_cache:
+        yield
     """
     Here, after yield,
     goes all "tear down" code for each test case
     aka "after test function" hook
     """
 
-    if not config.settings.hold_browser_open:
+    if handles_cache is not None:
+        request.node.user_properties.append(('element handles cache', handles_cache.counters))
+
+    if (
+        not config.settings.hold_browser_open
+        and browser.config._executor.is_driver_set
+        and (
+            assist.memory.outgrown(browser.config.driver, request.node.nodeid)
+            or not assist.reruns.park(request.node, browser.config.driver)
+        )
+    ):
         browser.quit()
 
 
+import web_test.assist.selenium.connection
 from web_test.assist.selenium.typing import WebDriver
 
 
@@ -125,11 +343,23 @@ def _driver_from(settings: config.Settings) -> WebDriver:
         )
         if not settings.remote_url
         else webdriver.Remote(
-            command_executor=settings.remote_url,
+            command_executor=web_test.assist.selenium.connection.shared(
+                settings.remote_url,
+                keep_alive=settings.remote_keep_alive,
+                pool_size=settings.remote_connection_pool_size,
+                command_timeout=settings.remote_command_timeout,
+                retries=settings.remote_connect_retries,
+                retry_backoff=settings.remote_retry_backoff,
+            ),
             options=driver_options,
         )
     )
 
+    if settings.fast_profile and settings.blocked_urls and hasattr(driver, 'execute_cdp_cmd'):
+        # only local chromium based drivers support DevTools commands
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': settings.blocked_urls})
+
     if settings.maximize_window:
         driver.maximize_window()
     else:
@@ -146,6 +376,15 @@ def _driver_from(settings: config.Settings) -> WebDriver:
     return driver
 
 
+@pytest.fixture
+def driver_from():
+    """
+    builds a driver by settings the same way the browser of tests is built,
+    for tests that need their own drivers, like benchmarks
+    """
+    return _driver_from
+
+
 from web_test.assist.selenium.typing import WebDriverOptions
 
 
@@ -171,6 +410,9 @@ def _driver_options_from(settings: config.Settings) -> WebDriverOptions:
     if settings.browser_name == supported.edge:
         options = EdgeOptions()
 
+    if settings.fast_profile and options:
+        _apply_fast_profile(settings, options)
+
     if settings.remote_url:
         options.set_capability(
             'screenResolution', settings.remote_screenResolution
@@ -186,18 +428,63 @@ def _driver_options_from(settings: config.Settings) -> WebDriverOptions:
     return options
 
 
-prev_test_screenshot = None
-prev_test_page_source = None
+def _apply_fast_profile(settings: config.Settings, options: WebDriverOptions):
+    import os
+    import tempfile
+    from selenium import webdriver
+    from web_test.assist.webdriver_manager import supported
+
+    cache_dir = os.path.join(
+        tempfile.gettempdir(),
+        'web-test-browser-cache',
+        settings.browser_name,
+        os.environ.get('PYTEST_XDIST_WORKER', 'master'),
+    )
+    """
+    shared between all tests of the same xdist worker,
+    but not between workers, to not corrupt the cache by concurrent browsers
+    """
+
+    options.page_load_strategy = 'eager'
+
+    if settings.browser_name in [supported.chrome, supported.chromium, supported.edge]:
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-background-networking')
+        options.add_argument('--disable-component-update')
+        options.add_argument('--disable-sync')
+        options.add_argument('--no-first-run')
+        options.add_argument(f'--disk-cache-dir={cache_dir}')
+        options.add_experimental_option(
+            'prefs', {'profile.managed_default_content_settings.images': 2}
+        )
+
+    if isinstance(options, webdriver.FirefoxOptions):
+        options.set_preference('permissions.default.image', 2)
+        options.set_preference('extensions.enabledScopes', 0)
+        options.set_preference('network.prefetch-next', False)
+        options.set_preference('network.dns.disablePrefetch', True)
+        options.set_preference('app.update.enabled', False)
+        options.set_preference('browser.cache.disk.parent_directory', cache_dir)
+
+
+prev_test_screenshot: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    'prev_test_screenshot', default=None
+)
+prev_test_page_source: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    'prev_test_page_source', default=None
+)
+"""
+context-local to not mix snapshots of tests run in different threads
+"""
 
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_setup(item):
     yield
 
-    global prev_test_screenshot
-    prev_test_screenshot = browser.config.last_screenshot
-    global prev_test_page_source
-    prev_test_page_source = browser.config.last_page_source
+    prev_test_screenshot.set(browser.config.last_screenshot)
+    prev_test_page_source.set(browser.config.last_page_source)
 
 
 from _pytest.nodes import Item
@@ -221,7 +508,7 @@ def pytest_runtest_makereport(item: Item, call: CallInfo):
 
     if result.when == 'call' and result.failed:
         last_screenshot = browser.config.last_screenshot
-        if last_screenshot and not last_screenshot == prev_test_screenshot:
+        if last_screenshot and not last_screenshot == prev_test_screenshot.get():
             allure.attach.file(
                 source=last_screenshot,
                 name='screenshot',
@@ -229,9 +516,54 @@ def pytest_runtest_makereport(item: Item, call: CallInfo):
             )
 
         last_page_source = browser.config.last_page_source
-        if last_page_source and not last_page_source == prev_test_page_source:
+        if last_page_source and not last_page_source == prev_test_page_source.get():
             allure.attach.file(
                 source=last_page_source,
                 name='page source',
                 attachment_type=allure.attachment_type.HTML,
             )
+
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubRemoteEnd(BaseHTTPRequestHandler):
+    """
+    answers any GET with a title, except the first GET of a path ending with /unavailable-once answered with 503
+    """
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path.endswith('/unavailable-once') and self.path not in self.server.requested:
+            self.server.requested.add(self.path)
+            self._answer(503, 'text/plain', b'unavailable')
+            return
+        self._answer(200, 'application/json', json.dumps({'value': 'stub title'}).encode())
+
+    def _answer(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def remote_end():
+    """
+    url of a stub remote WebDriver end, to check remote connections without a browser
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubRemoteEnd)
+    server.daemon_threads = True
+    server.requested = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield 'http://127.0.0.1:%s' % server.server_address[1]
+    server.shutdown()
+    server.server_close()
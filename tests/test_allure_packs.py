@@ -0,0 +1,37 @@
+import json
+
+from web_test.assist.allure import packs
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+
+def test_results_are_compacted_with_deduplication_and_expanded_back(tmp_path):
+    results = tmp_path / 'reports'
+    results.mkdir()
+    screenshot = b'\x89PNG' + bytes(range(256)) * 100
+    files = {}
+    for test in range(20):
+        files[f'{test}-result.json'] = json.dumps(
+            {'name': f'test_{test}', 'status': 'passed', 'attachments': [{'source': f'{test}-attachment.png'}]}
+        ).encode()
+        files[f'{test}-attachment.png'] = screenshot
+    files['nested/environment.properties'] = b'browser=chrome'
+    for name, content in files.items():
+        (results / name).parent.mkdir(exist_ok=True)
+        (results / name).write_bytes(content)
+
+    summary = packs.compact(results, tmp_path / 'packed', packs=3)
+
+    assert (summary.files, summary.unique, summary.packs) == (41, 22, 3)
+    assert summary.bytes_after < summary.bytes_before - 19 * len(screenshot)
+    assert sorted(path.name for path in (tmp_path / 'packed').iterdir()) == [
+        'index.json', 'pack-0.bin', 'pack-1.bin', 'pack-2.bin'
+    ]
+
+    assert packs.expand(tmp_path / 'packed', tmp_path / 'expanded') == 41
+    assert {
+        path.relative_to(tmp_path / 'expanded').as_posix(): path.read_bytes()
+        for path in (tmp_path / 'expanded').rglob('*')
+        if path.is_file()
+    } == files
@@ -0,0 +1,36 @@
+from allure_commons.model2 import Status, TestStepResult
+
+from web_test.assist.allure.coalescing import coalesced
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+
+def test_alike_passed_steps_are_coalesced_but_failed_ones_are_kept():
+    def step(name, status=Status.PASSED, steps=(), stop=10):
+        return TestStepResult(name=name, status=status, steps=list(steps), start=0, stop=stop)
+
+    def cells(count):
+        return [step(f"element(('xpath', './/td[{index}]')): should have no exact text ''") for index in range(count)]
+
+    failed_row = step('Extracting data from the row', Status.FAILED, [*cells(3), step('td[4]', Status.FAILED)])
+    failed_table = step('Check the table', Status.FAILED, [step('row 1', steps=cells(5)), failed_row])
+    last_cells = cells(3)
+    last_cells[-1].stop = 40
+
+    steps = coalesced([step('open', steps=cells(5)), *cells(2), failed_table, *last_cells], min_run=3)
+
+    cell = "element(('xpath', './/td[#]')): should have no exact text ''"
+    assert [each.name for each in steps[0].steps] == [f'{cell} ×5']
+    assert [steps[1].name, steps[2].name] == [cell.replace('#', '0'), cell.replace('#', '1')]
+    assert steps[3] is failed_table
+    assert [each.name for each in failed_table.steps] == ['row 1', 'Extracting data from the row']
+    assert len(failed_table.steps[0].steps) == 5
+    assert [each.name for each in failed_row.steps] == [cell.replace('#', str(index)) for index in range(3)] + ['td[4]']
+    assert steps[4].name == f'{cell} ×3'
+    assert steps[4].steps == [last_cells[0]]
+    assert [(each.name, each.value) for each in steps[4].parameters] == [
+        ('steps', '3'),
+        ('total', '60ms'),
+        ('min/avg/max', '10/20/40ms'),
+    ]
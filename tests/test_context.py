@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from selene import Config
+from selene.support.shared import browser as shared_browser
+
+from web_test.assist.selene import context
+from web_test.assist.selene.context import browser
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+title = browser.element('h1')
+"""
+built once, like elements on module level of page modules
+"""
+
+
+class _Driver:
+    def __init__(self, name):
+        self.name = name
+
+    def find_element(self, by, value):
+        return f'{value} of {self.name}'
+
+
+def test_browser_uses_the_config_of_the_current_context():
+    assert context.config() is shared_browser.config
+
+    with context.using(Config(driver=_Driver('outer'), timeout=1)):
+        assert title.locate() == 'h1 of outer'
+        with context.using(Config(driver=_Driver('inner'), timeout=2)):
+            assert browser.config.timeout == 2
+            assert title.locate() == 'h1 of inner'
+        assert browser.config.timeout == 1
+
+    assert context.config() is shared_browser.config
+
+
+def test_elements_are_located_by_the_browser_of_each_thread():
+    def located_in_own_browser(name):
+        with context.using(Config(driver=_Driver(name))):
+            return title.locate()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        located = list(pool.map(located_in_own_browser, [f'browser {index}' for index in range(8)]))
+
+    assert located == [f'h1 of browser {index}' for index in range(8)]
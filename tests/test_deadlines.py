@@ -0,0 +1,110 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from web_test.assist import project
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+CONFTEST = '''
+from web_test.assist import deadlines
+
+
+def pytest_configure(config):
+    active = deadlines.Deadlines(test_seconds=None, suite_seconds={suite_seconds})
+    config.pluginmanager.register(active)
+    deadlines.activate(active)
+'''
+
+HELPERS = '''
+import contextlib
+import time
+
+import pytest
+
+from selene.core.wait import Query, Wait
+
+from web_test.assist import deadlines
+from web_test.assist.selene.report import wait_with
+from web_test.test_markers import mark
+
+
+def wait():
+    return Wait(
+        'page',
+        at_most=5,
+        _decorator=wait_with(context=lambda **_: contextlib.nullcontext(), deadline=deadlines.waiting),
+    )
+
+
+def never(_):
+    raise AssertionError('not yet')
+'''
+
+TESTS = HELPERS + '''
+
+@mark.deadline(1)
+def test_hanging():
+    wait().for_(Query('ready', lambda _: True))
+    for _ in range(3):
+        wait().for_(Query('cell 1 loaded', never))
+
+
+def test_quick():
+    wait().for_(Query('ready', lambda _: True))
+'''
+
+TEARDOWN_TESTS = HELPERS + '''
+
+@pytest.fixture
+def cleanup():
+    yield
+    time.sleep(0.6)
+    wait().for_(Query('cleaned up', lambda _: True))
+
+
+def test_with_cleanup(cleanup):
+    wait().for_(Query('ready', lambda _: True))
+'''
+
+
+def _pytest_in(tmp_path, suite_seconds=None, tests=TESTS):
+    (tmp_path / 'conftest.py').write_text(textwrap.dedent(CONFTEST.format(suite_seconds=suite_seconds)))
+    (tmp_path / 'test_it.py').write_text(tests)
+    (tmp_path / 'pytest.ini').write_text('[pytest]\nmarkers =\n    deadline: deadline of the test\n')
+    return subprocess.run(
+        [sys.executable, '-m', 'pytest', '-p', 'no:cacheprovider', '-q', '--durations=0', 'test_it.py'],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONPATH': project.abs_path_from_project('')},
+    )
+
+
+def test_waits_are_shortened_to_the_test_deadline_and_then_fail_fast(tmp_path):
+    result = _pytest_in(tmp_path)
+
+    assert '1 failed, 1 passed' in result.stdout
+    assert 'test deadline of 1s is exhausted' in result.stdout
+    assert "in 1 waits for: page: cell # loaded" in result.stdout
+    assert 'outside of waits' in result.stdout
+    assert 'while waiting: ' in result.stdout
+    seconds = float(result.stdout.split('s call ')[0].split()[-1])
+    assert seconds < 3
+
+
+def test_tests_fail_fast_after_the_suite_deadline(tmp_path):
+    result = _pytest_in(tmp_path, suite_seconds=0.5)
+
+    assert '1 failed, 1 error' in result.stdout
+    assert 'suite deadline of 0.5s is exhausted' in result.stdout
+    assert 'deadlines: 2 tests failed by the suite deadline' in result.stdout
+
+
+def test_teardown_is_not_limited_by_the_suite_deadline(tmp_path):
+    result = _pytest_in(tmp_path, suite_seconds=0.5, tests=TEARDOWN_TESTS)
+
+    assert '1 passed' in result.stdout
+    assert 'error' not in result.stdout
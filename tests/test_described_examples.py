@@ -1,7 +1,8 @@
 """ Here is examples of described elements. To get the allure report, add the option --alluredir={dirname}
 Then run "allure serve {dirname}" """
-from selene import browser, have, be, by
+from selene import have, be, by
 
+from web_test.assist.selene.context import browser
 from web_test.pages.the_internet import PageWithModal, PageWithTables
 
 
@@ -71,6 +72,19 @@ def test_index_example():
     # > PageWithTables.table_one.row_number#2: should have values {'Email': 'fbach@yahoo.com', 'Due': '$51.00'}
 
 
+def test_example_with_table_and_several_rows():
+    page = PageWithTables()
+    page.open()
+    # > PageWithTables: open
+    page.table_one.should_have_rows([
+        {"Last Name": "Bach", "Email": "fbach@yahoo.com"},
+        {"Last Name": "Doe", "Due": "$100.00"},
+    ])
+    # > PageWithTables.table_one: should have rows [{'Last Name': 'Bach', 'Email': 'fbach@yahoo.com'}, ...]
+    # > PageWithTables.table_one: preparing cell locators for a table
+    # > PageWithTables.table_one.body: should have rows with [{'Last Name': 'Bach', 'Email': 'fbach@yahoo.com'}, ...]
+
+
 def test_example_with_table_and_custom_row():
     page = PageWithTables()
     page.open()
@@ -85,31 +99,35 @@ def test_example_with_table_and_custom_row():
     # > PageWithTables.table_two.rows: each has no (text jdoe@hotmail.com)
 
 
-""" Issues that cannot be solved easily """
-
-
-def test_chain_elements_is_not_preserved():
-    # When Selene creates a new element the naming chain is not preserved
+def test_chain_of_derived_elements_is_preserved():
+    # When Selene creates a new element from a described one, the naming chain is preserved
     page = PageWithModal()
     page.open()
     # > PageWithModal: open
 
     # Imagine we want to define an element by a text:
     page.modal.footer.element(by.text("Close")).click()
-    # > element('xpath', './/*[contains(@class,"MakeThisXPATHMoreRealisticWithSomeFrontendGarbage") or contains(@class,"modal")]').element('xpath', './/*[contains(@class,"MakeThisXPATHMoreRealisticWithSomeFrontendGarbage") or contains(@class,"modal-footer")]').element('xpath', './/*[text()[normalize-space(.) = concat("", "Close")]]'): click
+    # > PageWithModal.modal.footer.element(('xpath', './/*[text()[normalize-space(.) = concat("", "Close")]]')): click
 
-    # to fix this issue, we have to define all elements somewhere in or Pages/Elements. It may be not convenient,
-    # especially for Selene's filtering methods.
+    # the derived element is named by the last part of its locator, to give it a better name, see the next example
 
 
-def test_chain_elements_workaround():
-    """ ofcourse, it is the least convenient method """
+def test_chain_elements_with_custom_name():
+    """ a derived element can be described in place, the chain will be preserved anyway """
     page = PageWithModal()
     page.open()
     # > PageWithModal: open
-    modal_footer = page.modal.footer
-    modal_footer.element(by.text("Close")). \
-        as_("close button"). \
-        set_previous_name_chain_element(modal_footer). \
-        click()
+    page.modal.footer.element(by.text("Close")).as_("close button").click()
     # > PageWithModal.modal.footer.close button: click
+
+
+def test_page_opened_after_setup_flow():
+    """ a repeated setup flow is performed once, next tests restore the browser state captured after it """
+    page = PageWithModal().open_after('modal closed', lambda page: page.modal.close())
+    # > PageWithModal: open after: name 'modal closed', ...
+    # >> PageWithModal: open
+    # >> PageWithModal.modal: close
+    # (or, if browser_state_snapshots is on and the flow was already performed in this process,
+    #  only the state after it is restored)
+    page.modal.header.should(be.hidden)
+    # > PageWithModal.modal.header: should be hidden
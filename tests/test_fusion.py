@@ -0,0 +1,70 @@
+import contextlib
+import time
+
+import pytest
+from selene import Browser, Config, be
+
+from web_test.assist import deadlines
+from web_test.assist.selene import fusion
+from web_test.assist.selene.report import wait_with
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+
+def test_fused_chain_reports_the_condition_that_actually_failed(monkeypatch):
+    class Found:
+        def is_displayed(self):
+            return True
+
+        def is_enabled(self):
+            return False
+
+    class Driver:
+        def execute_script(self, script, path, checks):
+            return [checks.index('enabled'), None]
+
+        def find_element(self, by, value):
+            return Found()
+
+    steps = []
+
+    @contextlib.contextmanager
+    def step(title, params):
+        try:
+            yield
+        except Exception:
+            steps.append((title, 'failed'))
+            raise
+        steps.append((title, 'passed'))
+
+    monkeypatch.setattr(fusion, 'enabled', True)
+    element = Browser(Config(driver=Driver(), timeout=0.1, _wait_decorator=wait_with(context=step))).element('#x')
+
+    with pytest.raises(Exception):
+        fusion.fused(element).should(be.visible).should(be.enabled).click()
+
+    assert steps == [
+        ("element('#x'): should be visible", 'passed'),
+        ("element('#x'): should be enabled", 'failed'),
+    ]
+
+
+def test_fused_chain_is_limited_by_deadlines(monkeypatch):
+    class Driver:
+        def execute_script(self, script, path, checks):
+            return [0, None]
+
+        def find_element(self, by, value):
+            raise AssertionError('not found')
+
+    active = deadlines.Deadlines(test_seconds=None, suite_seconds=None)
+    active.test = deadlines.Budget('test', 0.3)
+    monkeypatch.setattr(deadlines, '_active', active)
+    monkeypatch.setattr(fusion, 'enabled', True)
+    element = Browser(Config(driver=Driver(), timeout=5)).element('#x')
+
+    started = time.monotonic()
+    with pytest.raises(pytest.fail.Exception, match='test deadline of 0.3s is exhausted'):
+        fusion.fused(element).should(be.visible).click()
+    assert time.monotonic() - started < 2
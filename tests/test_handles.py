@@ -0,0 +1,64 @@
+from selene import Browser, Config
+from selenium.common.exceptions import StaleElementReferenceException
+
+from web_test.assist.allure.chainable_naming import ChainableNamingElement
+from web_test.assist.selene import handles
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+
+def test_handles_cache_finds_named_elements_once_until_stale():
+    finds = []
+
+    class Found:
+        def __init__(self, parent, selector):
+            self.parent = parent
+            self.selector = selector
+            self.stale = False
+
+        @property
+        def tag_name(self):
+            if self.stale:
+                raise StaleElementReferenceException()
+            return 'div'
+
+        def find_element(self, by, value):
+            self.tag_name
+            finds.append(value)
+            return Found(self.parent, value)
+
+    class Driver:
+        def find_element(self, by, value):
+            finds.append(value)
+            return Found(self, value)
+
+    class Page(ChainableNamingElement):
+        def __init__(self, browser):
+            super().__init__()
+            self.modal = browser.element('.modal')
+            self.section = self.modal.element('.modal-body')
+
+    page = Page(Browser(Config(driver=Driver())))
+
+    with handles.caching() as cache:
+        section = page.section.locate()
+        assert page.section.locate() is section
+        assert finds == ['.modal', '.modal-body']
+
+        page.modal.locate().stale = True
+        section.stale = True
+        assert page.section.locate() is not section
+        assert finds == ['.modal', '.modal-body', '.modal', '.modal-body']
+
+        handles.navigated()
+        page.section.locate()
+        assert cache.counters == {'hits': 3, 'misses': 6, 'stale': 2}
+
+        # differently located elements of the same name, like a reassigned attribute, are not mixed up
+        save = page.modal.element('.save').as_('button')
+        cancel = page.modal.element('.cancel').as_('button')
+        assert save.get_full_path() == cancel.get_full_path()
+        assert save.locate().selector == '.save'
+        assert cancel.locate().selector == '.cancel'
+        assert save.locate().selector == '.save'
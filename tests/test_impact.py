@@ -0,0 +1,79 @@
+import subprocess
+import textwrap
+from pathlib import Path
+
+from web_test.assist import impact
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+PAGE = textwrap.dedent(
+    '''
+    LOCATOR = '#table1'
+
+
+    def open_page():
+        return 'opened'
+
+
+    def sort_table():
+        return 'sorted'
+    '''
+)
+
+
+def _git(root: Path, *args):
+    subprocess.run(['git', *args], cwd=root, check=True, capture_output=True)
+
+
+def _page_module(root: Path):
+    pages = root / 'pages'
+    pages.mkdir()
+    (pages / 'tables.py').write_text(PAGE)
+    namespace = {}
+    exec(compile(PAGE, str(pages / 'tables.py'), 'exec'), namespace)
+    return namespace
+
+
+def test_recorder_keeps_only_project_functions(tmp_path):
+    page = _page_module(tmp_path)
+
+    with impact.Recorder(tmp_path) as recorder:
+        page['open_page']()
+        textwrap.dedent('  not a project function')
+
+    assert recorder.dependencies() == {'pages/tables.py': [('open_page', 5, 6)]}
+
+
+def test_selection_by_changed_functions_and_module_level(tmp_path):
+    page = _page_module(tmp_path)
+    tests = {}
+    for test, step in (('test_open', 'open_page'), ('test_sort', 'sort_table')):
+        with impact.Recorder(tmp_path) as recorder:
+            page[step]()
+        tests[test] = recorder.dependencies()
+    _git(tmp_path, 'init', '-q')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, '-c', 'user.name=test', '-c', 'user.email=test@test', 'commit', '-qm', 'page')
+    commit = subprocess.run(
+        ['git', 'rev-parse', 'HEAD'], cwd=tmp_path, capture_output=True, text=True
+    ).stdout.strip()
+    page_file = tmp_path / 'pages' / 'tables.py'
+
+    page_file.write_text(PAGE.replace("'sorted'", "'sorted by name'"))
+    assert impact.affected(tests, impact.changes_since(commit, tmp_path)) == {'test_sort'}
+
+    page_file.write_text(PAGE.replace('#table1', '#table2'))
+    assert impact.affected(tests, impact.changes_since(commit, tmp_path)) == {'test_open', 'test_sort'}
+
+    page_file.write_text(PAGE)
+    (tmp_path / 'README.md').write_text('docs')
+    (tmp_path / 'pages' / 'new.py').write_text('')
+    _git(tmp_path, 'add', '.')
+    assert impact.affected(tests, impact.changes_since(commit, tmp_path)) == set()
+
+    (tmp_path / 'settings.py').write_text('')
+    _git(tmp_path, 'add', '.')
+    _git(tmp_path, '-c', 'user.name=test', '-c', 'user.email=test@test', 'commit', '-qm', 'settings')
+    (tmp_path / 'settings.py').write_text('timeout = 1')
+    assert impact.affected(tests, impact.changes_since('HEAD', tmp_path)) is None
@@ -0,0 +1,138 @@
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from web_test.assist.selenium import hub as local_hub
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+STUB_DRIVER = '''
+import itertools, json, sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+ids = itertools.count()
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.reply({'ready': True})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or 'null')
+        if self.path != '/session':
+            self.reply(None)
+        elif 'stub:malformed' in payload['capabilities']['alwaysMatch']:
+            self.reply_raw(200, b'not json')
+        elif 'stub:broken' in payload['capabilities']['alwaysMatch']:
+            self.reply_raw(500, json.dumps({'value': {'error': 'unknown error'}}).encode())
+        else:
+            self.reply({'sessionId': f'session-{next(ids)}', 'capabilities': {}})
+
+    def do_DELETE(self):
+        self.reply(None)
+
+    def reply(self, value):
+        self.reply_raw(200, json.dumps({'value': value}).encode())
+
+    def reply_raw(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+HTTPServer(('127.0.0.1', int(sys.argv[1].split('=')[1])), Handler).serve_forever()
+'''
+
+
+@pytest.fixture
+def hub(tmp_path, monkeypatch):
+    driver = tmp_path / 'stub_driver'
+    driver.write_text(f'#!{sys.executable}\n{STUB_DRIVER}')
+    driver.chmod(0o755)
+    monkeypatch.setitem(local_hub.executables, 'stub', lambda: str(driver))
+
+    hub = local_hub.Hub(('127.0.0.1', 0), limit=1, prespawned={'stub': 1}, queue_timeout=10)
+    threading.Thread(target=hub.serve_forever, daemon=True).start()
+    yield hub
+    hub.shutdown()
+    hub.server_close()
+
+
+def _request(hub, method, path, payload=None):
+    request = urllib.request.Request(
+        hub.url + path,
+        data=json.dumps(payload).encode() if payload is not None else None,
+        method=method,
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())['value']
+    except urllib.error.HTTPError as error:
+        return json.loads(error.read())['value']
+
+
+def test_local_hub_queues_sessions_over_limit(hub):
+    capabilities = {'capabilities': {'alwaysMatch': {'browserName': 'stub', 'enableVNC': True}}}
+    first = _request(hub, 'POST', '/session', capabilities)['sessionId']
+
+    second = []
+    waiting = threading.Thread(target=lambda: second.append(_request(hub, 'POST', '/session', capabilities)))
+    waiting.start()
+    time.sleep(0.3)
+    assert second == []
+    assert _request(hub, 'GET', '/status')['queued'] == 1
+
+    _request(hub, 'POST', f'/session/{first}/url', {'url': 'about:blank'})
+    _request(hub, 'DELETE', f'/session/{first}')
+    waiting.join(timeout=10)
+    assert second[0]['sessionId'] != first
+    assert _request(hub, 'GET', '/status')['active'] == 1
+
+
+@pytest.mark.parametrize('failure', ['stub:malformed', 'stub:broken'])
+def test_local_hub_frees_the_slot_if_session_is_not_created(hub, failure):
+    failing = {'capabilities': {'alwaysMatch': {'browserName': 'stub', failure: True}}}
+    assert _request(hub, 'POST', '/session', failing)['error'] in ('session not created', 'unknown error')
+    assert _request(hub, 'GET', '/status')['active'] == 0
+
+    capabilities = {'capabilities': {'alwaysMatch': {'browserName': 'stub'}}}
+    assert _request(hub, 'POST', '/session', capabilities)['sessionId']
+
+
+@mark.tag.benchmark
+def test_local_hub_queueing(hub):
+    import allure
+
+    hub.queue.limit = 2
+    capabilities = {'capabilities': {'alwaysMatch': {'browserName': 'stub'}}}
+    waits = []
+
+    def client():
+        started = time.perf_counter()
+        session_id = _request(hub, 'POST', '/session', capabilities)['sessionId']
+        waits.append(time.perf_counter() - started)
+        time.sleep(0.2)
+        _request(hub, 'DELETE', f'/session/{session_id}')
+
+    clients = [threading.Thread(target=client) for _ in range(6)]
+    for each in clients:
+        each.start()
+    for each in clients:
+        each.join()
+
+    allure.attach(
+        '\n'.join(f'{wait:.3f}s' for wait in sorted(waits)),
+        name='new session waits with limit 2 for 6 clients',
+        attachment_type=allure.attachment_type.TEXT,
+    )
+    assert max(waits) >= 0.4
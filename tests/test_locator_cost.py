@@ -0,0 +1,20 @@
+from web_test.assist.selene.locator_cost import css_from
+from web_test.pages.the_internet import uglify_class_name
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+
+def test_locator_cost_finds_css_equivalents_of_simple_xpaths():
+    assert css_from(uglify_class_name('modal-title')) == (
+        ':scope [class*="MakeThisXPATHMoreRealisticWithSomeFrontendGarbage"], :scope [class*="modal-title"]'
+    )
+    assert css_from('.//td[3]') == ':scope td:nth-of-type(3)'
+    assert css_from('./tbody/tr[@data-id="1" and @class]') == ':scope > tbody > tr[data-id="1"][class]'
+    assert css_from('//table') is None
+    assert css_from('//table', from_root=True) == 'table'
+    assert css_from(".//th[.//text()='Email']") is None
+    assert css_from('./preceding-sibling::*') is None
+    assert css_from('.//tr[2][@class="row"]') == ':scope tr:nth-of-type(2)[class="row"]'
+    assert css_from('.//tr[@class="row"][2]') is None
+    assert css_from('.//*[@a][2]') is None
@@ -0,0 +1,39 @@
+"""
+Ranks locators of page objects by cost of finding them on recorded pages,
+record pages first via run/tests_recording_offline_mirror.sh,
+it is deselected by default (see pytest_collection_modifyitems in conftest.py),
+then run via: pytest tests -m benchmark -k locator
+"""
+import allure
+import pytest
+
+import config
+import web_test.app
+import web_test.pages
+from web_test.assist import mirror, project
+from web_test.assist.selene import locator_cost
+from web_test.test_markers import mark
+
+pytestmark = mark.benchmark_module
+
+
+def test_locator_cost(driver_from):
+    directory = project.abs_path_from_project(config.settings.mirror_dir)
+    pages = mirror.Snapshots(directory).keys(content_type='text/html')
+    if not pages:
+        pytest.skip(f'no pages recorded in {directory}')
+    locators = locator_cost.collected(web_test.app, web_test.pages)
+
+    driver = driver_from(config.settings.copy(update={'headless': True}))
+    try:
+        with mirror.serving(directory, 'replay') as server:
+            costs = locator_cost.profiled(driver, locators, [server.url(f'https://{page}') for page in pages])
+    finally:
+        driver.quit()
+
+    allure.attach(
+        locator_cost.report(costs),
+        name='locators ranked by cost',
+        attachment_type=allure.attachment_type.TEXT,
+    )
+    assert len(costs) == len(locators)
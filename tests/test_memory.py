@@ -0,0 +1,120 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from web_test.assist import memory
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+
+def _autoscaler(tmp_path, **kwargs):
+    return memory.Autoscaler(
+        browser_name='chrome',
+        browser_rss_mb=500,
+        headroom_mb=1000,
+        recycle_rss_mb=1500,
+        stats=tmp_path / 'stats.json',
+        **kwargs,
+    )
+
+
+def test_workers_fit_available_memory_but_not_more_than_cpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(memory, 'available_mb', lambda: 3200)
+    autoscaler = _autoscaler(tmp_path)
+
+    assert autoscaler.workers(cpus=8) == 4
+    assert autoscaler.workers(cpus=2) == 2
+
+    autoscaler.samples.extend([700, 900, 2000])
+    assert autoscaler.workers(cpus=8) == 2
+
+    monkeypatch.setattr(memory, 'available_mb', lambda: 900)
+    assert autoscaler.workers(cpus=8) == 1
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='memory is measured via /proc')
+def test_rss_includes_child_processes():
+    own = memory.rss_mb(os.getpid())
+    child = subprocess.Popen(
+        [sys.executable, '-c', 'import time; data = b"x" * 64 * 2**20; print("ready", flush=True); time.sleep(30)'],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        child.stdout.readline()
+        assert memory.rss_mb(os.getpid()) > own + 64
+    finally:
+        child.kill()
+        child.wait()
+
+
+class _Clock:
+    """
+    time of the memory module that passes only by sleeping
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_starting_browsers_waits_for_enough_memory_but_not_longer_than_timeout(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(memory, 'time', clock)
+    available = iter([1200, 1300, 1600])
+    monkeypatch.setattr(memory, 'available_mb', lambda: next(available))
+    autoscaler = _autoscaler(tmp_path, start_timeout=10)
+
+    assert autoscaler.starting(lambda: 'driver') == 'driver'
+    assert clock.now == 2
+    assert autoscaler._report == ['memory: waited 2s to start a browser, 1600 MB available for 500 MB expected']
+
+    monkeypatch.setattr(memory, 'available_mb', lambda: 1100)
+    assert autoscaler.starting(lambda: 'driver') == 'driver'
+    assert clock.now == 12
+
+    monkeypatch.setattr(memory, 'available_mb', lambda: None)
+    assert autoscaler.starting(lambda: 'driver') == 'driver'
+    assert clock.now == 12
+
+
+def test_outgrown_browsers_are_recycled_and_first_ones_are_sampled(tmp_path, monkeypatch):
+    measured = iter([600, 1600, 700, None])
+    monkeypatch.setattr(memory, 'browser_rss_mb', lambda driver: next(measured))
+    autoscaler = _autoscaler(tmp_path, samples=2)
+
+    assert [autoscaler.outgrown('driver', f'test_{index}') for index in range(4)] == [False, True, False, False]
+    assert autoscaler.samples == [600, 1600]
+    assert autoscaler.expected_rss_mb == 1100
+    assert autoscaler._report == ['memory: recycled the browser of test_1 at 1600 MB > 1500 MB']
+
+
+def test_samples_and_decisions_of_workers_are_merged_and_stored_by_controller(tmp_path):
+    from types import SimpleNamespace
+
+    worker = _autoscaler(tmp_path)
+    worker_config = SimpleNamespace(workerinput={'workerid': 'gw0'}, workeroutput={})
+    worker.pytest_sessionstart(SimpleNamespace(config=worker_config))
+    worker.samples.extend([400, 600])
+    worker._log('recycled the browser of test_1 at 1600 MB > 1500 MB')
+    worker.pytest_sessionfinish(SimpleNamespace(config=worker_config))
+    assert not (tmp_path / 'stats.json').exists()
+
+    controller = _autoscaler(tmp_path)
+    controller.samples.append(800)
+    controller.pytest_testnodedown(SimpleNamespace(workeroutput=worker_config.workeroutput), error=None)
+    controller.pytest_sessionfinish(SimpleNamespace(config=SimpleNamespace()))
+
+    assert controller._report == [
+        'memory: gw0: recycled the browser of test_1 at 1600 MB > 1500 MB',
+        'memory: measured 600 MB per chrome by 3 samples',
+    ]
+    assert _autoscaler(tmp_path).expected_rss_mb == 600
@@ -0,0 +1,25 @@
+from selene import be, by, have
+
+from web_test.assist.selene import observer
+from web_test.assist.selene.context import browser
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+
+def test_observer_wait_engine_supports_entities_and_conditions():
+    rows = browser.element('#table1').all('tbody tr')
+    assert observer.path_of(rows[1].element(by.xpath('./td'))) == [
+        ('first', 'css selector', '#table1'),
+        ('all', 'css selector', 'tbody tr'),
+        ('index', 1, None),
+        ('first', 'xpath', './td'),
+    ]
+    assert observer.path_of(rows.by(have.text('x'))) is None
+
+    assert observer.supported(rows[1], be.visible) == ('visible', None)
+    assert observer.supported(rows[1], have.exact_text('has text')) == ('exact_text', 'has text')
+    assert observer.supported(rows[1], have.text('Doe')) == ('text', 'Doe')
+    assert observer.supported(rows, have.size_greater_than_or_equal(2)) == ('size_greater_than_or_equal', 2)
+    assert observer.supported(rows[1], have.no.text('Doe')) is None
+    assert observer.supported(rows, have.size_less_than(2)) is None
@@ -0,0 +1,64 @@
+import argparse
+from types import SimpleNamespace
+
+import pytest
+
+from web_test.alternative.pytest.project.settings import Option
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+
+class _Settings:
+    def __init__(self, request):
+        self.request = request
+
+    @Option.default(6.0)
+    def timeout(self):
+        pass
+
+    @Option.default(True)
+    def headless(self):
+        pass
+
+
+def _request(getoption, **config):
+    return SimpleNamespace(config=SimpleNamespace(stash=pytest.Stash(), getoption=getoption, **config))
+
+
+def test_options_are_resolved_once_per_session_into_immutable_snapshot():
+    parsed = []
+
+    def getoption(name):
+        parsed.append(name)
+        return {'--timeout': 2.5, '--headless': False}[name]
+
+    settings = _Settings(_request(getoption))
+
+    assert (settings.timeout, settings.headless, settings.timeout) == (2.5, False, 2.5)
+    assert sorted(parsed) == ['--headless', '--timeout']
+    with pytest.raises(TypeError):
+        Option.snapshot(_Settings, settings.request.config)['--timeout'] = 1
+
+
+def test_options_are_shared_by_controller_with_xdist_workers():
+    controller = _request({'--timeout': 2.5, '--headless': False}.get).config
+    node = SimpleNamespace(config=controller, workerinput={})
+
+    Option.share_with(node, from_cls=_Settings)
+
+    def not_parsed_again(name):
+        raise AssertionError(f'{name} is parsed again on the worker')
+
+    worker = _Settings(_request(not_parsed_again, workerinput=node.workerinput))
+    assert (worker.timeout, worker.headless) == (2.5, False)
+    assert _Settings(SimpleNamespace(config=controller)).timeout == 2.5
+
+
+def test_bool_options_are_parsed_from_command_line_strings():
+    parser = argparse.ArgumentParser()
+    Option.register_all(from_cls=_Settings, in_parser=SimpleNamespace(addoption=parser.add_argument))
+
+    options = parser.parse_args(['--headless', 'False', '--timeout', '2.5'])
+
+    assert (options.headless, options.timeout) == (False, 2.5)
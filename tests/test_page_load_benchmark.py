@@ -0,0 +1,76 @@
+"""
+Benchmarks are not functional checks, they just measure and report timings,
+they are deselected by default (see pytest_collection_modifyitems in conftest.py),
+run them via: pytest tests -m benchmark
+"""
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import allure
+
+import config
+from web_test.test_markers import mark
+
+pytestmark = mark.benchmark_module
+
+
+class _HeavyPage(BaseHTTPRequestHandler):
+    """
+    Serves a page with a lot of slow images, like a typical page full of ads and pictures
+    """
+
+    images_count = 30
+    image_delay = 0.1
+
+    def do_GET(self):
+        if self.path.startswith('/image'):
+            time.sleep(self.image_delay)
+            body, content_type = b'GIF89a', 'image/gif'
+        else:
+            images = ''.join(
+                f'<img src="/image/{time.time_ns()}/{index}.gif">' for index in range(self.images_count)
+            )
+            body, content_type = f'<html><body><h1>Heavy page</h1>{images}</body></html>'.encode(), 'text/html'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _page_load_timings(driver_from, settings: config.Settings, url: str, times: int = 5) -> list:
+    driver = driver_from(settings)
+    try:
+        timings = []
+        for _ in range(times):
+            started = time.perf_counter()
+            driver.get(url)
+            timings.append(time.perf_counter() - started)
+        return timings
+    finally:
+        driver.quit()
+
+
+def test_fast_profile_page_load(driver_from):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _HeavyPage)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/'
+    try:
+        default = _page_load_timings(driver_from, config.settings.copy(update={'fast_profile': False}), url)
+        fast = _page_load_timings(driver_from, config.settings.copy(update={'fast_profile': True}), url)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    allure.attach(
+        f'default profile: median {statistics.median(default):.3f}s, all: {default}\n'
+        f'fast profile: median {statistics.median(fast):.3f}s, all: {fast}',
+        name='page load timings',
+        attachment_type=allure.attachment_type.TEXT,
+    )
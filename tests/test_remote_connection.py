@@ -0,0 +1,36 @@
+from selenium.webdriver.remote.command import Command
+
+from web_test.assist.selenium.connection import TunedRemoteConnection
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+
+def test_tuned_connection_keeps_settings_and_pool_on_close(remote_end):
+    connection = TunedRemoteConnection(remote_end, pool_size=3, command_timeout=7, retries=2, keep_pool_on_close=True)
+    pool = connection._conn.connection_from_url(remote_end)
+
+    connection.close()
+
+    assert connection._conn.connection_from_url(remote_end) is pool
+    assert pool.pool.maxsize == 3
+    assert pool.timeout.read_timeout == 7
+    assert pool.retries.connect == 2
+    assert pool.retries.read == 0
+
+
+def test_not_shared_tuned_connection_closes_its_pool(remote_end):
+    connection = TunedRemoteConnection(remote_end)
+    pool = connection._conn.connection_from_url(remote_end)
+
+    connection.close()
+
+    assert connection._conn.connection_from_url(remote_end) is not pool
+
+
+def test_tuned_connection_without_keep_alive_is_tuned_per_command(remote_end):
+    connection = TunedRemoteConnection(remote_end, keep_alive=False, retries=1, retry_backoff=0)
+
+    assert connection._get_connection_manager().connection_pool_kw['retries'].total == 1
+    assert connection._request('GET', f'{remote_end}/session/stub/unavailable-once')['value'] == 'stub title'
+    assert connection.execute(Command.GET_TITLE, {'sessionId': 'stub'})['value'] == 'stub title'
@@ -0,0 +1,39 @@
+"""
+Benchmarks are not functional checks, they just measure and report timings,
+they are deselected by default (see pytest_collection_modifyitems in conftest.py),
+run them via: pytest tests -m benchmark
+(the stub remote end is the remote_end fixture from conftest.py)
+"""
+import time
+
+import allure
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from web_test.assist.selenium.connection import TunedRemoteConnection
+from web_test.test_markers import mark
+
+pytestmark = mark.benchmark_module
+
+COMMANDS = 1000
+
+
+def _seconds_for_trivial_commands(connection: RemoteConnection) -> float:
+    started = time.perf_counter()
+    for _ in range(COMMANDS):
+        response = connection.execute(Command.GET_TITLE, {'sessionId': 'stub'})
+        assert response['value'] == 'stub title'
+    return time.perf_counter() - started
+
+
+def test_remote_connection_pooling(remote_end):
+    plain = _seconds_for_trivial_commands(RemoteConnection(remote_end, keep_alive=False))
+    pooled = _seconds_for_trivial_commands(TunedRemoteConnection(remote_end))
+
+    allure.attach(
+        f'without pooling: {plain:.3f}s\n'
+        f'with pooling: {pooled:.3f}s\n'
+        f'per command: {plain / COMMANDS * 1000:.3f}ms vs {pooled / COMMANDS * 1000:.3f}ms',
+        name=f'{COMMANDS} trivial remote commands',
+        attachment_type=allure.attachment_type.TEXT,
+    )
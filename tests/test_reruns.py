@@ -0,0 +1,141 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+from web_test.assist import project
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+CONFTEST = '''
+from web_test.assist import reruns
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(
+        reruns.Controller(budget={budget}, breaker_window=4, breaker_failure_rate=0.75, reuse_session=False, stats='stats.json'),
+    )
+
+
+def pytest_runtest_logreport(report):
+    with open('reports.txt', 'a') as file:
+        file.write(f'{{report.nodeid}} {{report.when}}\\n')
+'''
+
+TESTS = '''
+import pathlib
+
+from web_test.test_markers import mark
+
+order = pathlib.Path('order.txt')
+
+
+def attempt(name):
+    with order.open('a') as file:
+        file.write(name + '\\n')
+    return order.read_text().splitlines().count(name)
+
+
+@mark.flaky(reruns=2)
+def test_flaky():
+    assert attempt('flaky') > 1
+
+
+def test_next():
+    attempt('next')
+
+
+@mark.flaky(reruns=2)
+def test_broken():
+    attempt('broken')
+    assert False
+'''
+
+
+LAST_FLAKY_PASSES_TESTS = '''
+import pytest
+
+from web_test.test_markers import mark
+
+
+@pytest.fixture(scope='session')
+def browser():
+    yield
+
+
+def test_first(browser):
+    pass
+
+
+@mark.flaky(reruns=2)
+def test_last(browser):
+    pass
+'''
+
+
+def _pytest_in(tmp_path, budget, tests=TESTS):
+    (tmp_path / 'conftest.py').write_text(textwrap.dedent(CONFTEST.format(budget=budget)))
+    (tmp_path / 'test_it.py').write_text(tests)
+    (tmp_path / 'pytest.ini').write_text('[pytest]\nmarkers =\n    rerun: rerun on failure\n')
+    return subprocess.run(
+        [sys.executable, '-m', 'pytest', '-p', 'no:cacheprovider', '-q', 'test_it.py'],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONPATH': project.abs_path_from_project('')},
+    )
+
+
+def test_reruns_are_deferred_to_session_end_within_budget(tmp_path):
+    result = _pytest_in(tmp_path, budget=2)
+
+    assert (tmp_path / 'order.txt').read_text().split() == ['flaky', 'next', 'broken', 'flaky', 'broken']
+    assert '1 failed, 2 passed, 2 rerun' in result.stdout
+    assert json.loads((tmp_path / 'stats.json').read_text()) == {
+        'test_it.py::test_broken': {'failures': 1, 'recoveries': 0, 'reruns': 1, 'runs': 1},
+        'test_it.py::test_flaky': {'failures': 1, 'recoveries': 1, 'reruns': 1, 'runs': 1},
+    }
+
+
+def test_reruns_are_limited_by_budget(tmp_path):
+    result = _pytest_in(tmp_path, budget=1)
+
+    assert (tmp_path / 'order.txt').read_text().split() == ['flaky', 'next', 'broken', 'flaky']
+    assert '1 failed, 2 passed, 1 rerun' in result.stdout
+    assert 'reruns: 1 of budget 1 used' in result.stdout
+
+
+def test_last_flaky_test_that_passed_is_torn_down_once_with_the_session(tmp_path):
+    result = _pytest_in(tmp_path, budget=2, tests=LAST_FLAKY_PASSES_TESTS)
+
+    assert '2 passed' in result.stdout
+    assert (tmp_path / 'reports.txt').read_text().splitlines() == [
+        f'test_it.py::test_{name} {when}' for name in ('first', 'last') for when in ('setup', 'call', 'teardown')
+    ]
+
+
+def test_breaker_opens_at_the_failure_rate_of_recent_attempts_and_closes_below_it():
+    from types import SimpleNamespace
+
+    from web_test.assist import reruns
+
+    controller = reruns.Controller(
+        budget=10, breaker_window=4, breaker_failure_rate=0.75, reuse_session=False, stats='stats.json'
+    )
+
+    def attempted(*outcomes):
+        for outcome in outcomes:
+            report = SimpleNamespace(when='call', failed=outcome == 'failed', outcome=outcome)
+            controller.pytest_runtest_logreport(report)
+        return controller.check_breaker()
+
+    assert not attempted('failed', 'failed', 'failed')
+    assert attempted('rerun')
+    assert attempted('passed')
+    assert not attempted('passed')
+    assert controller._report == [
+        'reruns: circuit breaker opened at failure rate 4/4',
+        'reruns: circuit breaker closed at failure rate 2/4',
+    ]
@@ -34,7 +34,7 @@ def test_bing():
 from web_test.test_markers import mark
 
 
-@mark.pending                                                                        # todo: find a way to automatically skip empty tests, maybe use some pytest plugin
+@mark.pending
 def test_yahoo():
     """
     Pending test example (Option 2)
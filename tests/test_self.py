@@ -1,5 +1,6 @@
 import config
 from web_test import __version__
+from web_test.assist.python import etc
 from web_test.test_markers import mark
 
 
@@ -15,3 +16,154 @@ def test_author():
 
 def test_version():
     assert __version__ == '0.1.0'
+
+
+def test_benchmarks_are_deselected_unless_asked_for_explicitly():
+    import subprocess
+    import sys
+
+    from web_test.assist import project
+
+    def collected(*args):
+        result = subprocess.run(
+            [sys.executable, '-m', 'pytest', '-p', 'no:cacheprovider', '--collect-only', '-q', *args],
+            cwd=project.abs_path_from_project(''),
+            capture_output=True,
+            text=True,
+        )
+        return [line for line in result.stdout.splitlines() if 'benchmark.py::' in line]
+
+    pooling = 'tests/test_remote_connection_benchmark.py::test_remote_connection_pooling'
+    assert collected('tests') == []
+    assert collected(pooling) == [pooling]
+    assert collected('tests/test_remote_connection_benchmark.py') == [pooling]
+    assert pooling in collected('tests', '-m', 'benchmark')
+
+
+def test_empty_body_detection():
+    def empty():
+        """ just a docstring """
+
+    def not_empty():
+        """ just a docstring """
+        assert True
+
+    assert etc.has_empty_body(empty)
+    assert not etc.has_empty_body(not_empty)
+
+    assigned_lambda = lambda: None  # noqa: E731
+
+    class Tests:
+        async def empty(self):
+            ...
+
+    assert not etc.has_empty_body(assigned_lambda)
+    assert not etc.has_empty_body(lambda: None)
+    assert etc.has_empty_body(Tests.empty)
+
+
+def test_slotted_elements_keep_their_names_while_weakly_cacheable():
+    import gc
+    import weakref
+
+    from web_test.assist.allure.chainable_naming import Child, SlottedChainableNamingElement
+    from web_test.pages.the_internet import PageWithModal, PageWithTables
+
+    class Section(SlottedChainableNamingElement):
+        __slots__ = ()
+
+    class Page(SlottedChainableNamingElement):
+        __slots__ = ()
+        section = Child(lambda page: Section())
+
+    assert PageWithModal().modal.get_full_path() == 'PageWithModal.modal'
+    assert PageWithTables().table_one.get_full_path() == 'PageWithTables.table_one'
+
+    page = Page()
+    section = page.section
+    assert page.section is section
+    page_ref = weakref.ref(page)
+    del page
+    gc.collect()
+    assert section.get_full_path() == 'Page.section'
+
+    del section
+    gc.collect()
+    assert page_ref() is None
+
+
+def test_sliced_elements_are_named_by_their_slices():
+    from web_test.assist.allure.chainable_naming import ChainableNamingElement
+    from web_test.assist.selene.context import browser
+
+    class Table(ChainableNamingElement):
+        def __init__(self):
+            super().__init__()
+            self.rows = browser.all('tr')
+
+    table = Table()
+    assert table.rows[1:3].get_full_path() == 'Table.rows[1:3]'
+    assert table.rows[:3].get_full_path() == 'Table.rows[:3]'
+    assert table.rows[::2].get_full_path() == 'Table.rows[::2]'
+    assert table.rows.sliced(1, 3).get_full_path() == 'Table.rows[1:3]'
+
+
+def test_mirror_replays_recorded_pages(tmp_path):
+    import urllib.request
+    from web_test.assist import mirror
+
+    snapshots = mirror.Snapshots(str(tmp_path))
+    snapshots.put(
+        'the-internet.herokuapp.com/tables',
+        (200, 'text/html', b'<a href="https://the-internet.herokuapp.com/">home</a>'),
+    )
+
+    with mirror.serving(str(tmp_path), 'replay') as server:
+        mirrored = mirror.url('https://the-internet.herokuapp.com/tables')
+        assert mirrored == f'{server.origin}/the-internet.herokuapp.com/tables'
+        with urllib.request.urlopen(mirrored) as response:
+            assert response.read() == f'<a href="{server.origin}/the-internet.herokuapp.com/">home</a>'.encode()
+
+    assert mirror.url('https://the-internet.herokuapp.com/tables') == 'https://the-internet.herokuapp.com/tables'
+
+
+def test_mirror_keeps_empty_paths_so_mirrored_base_url_is_joined_as_original(tmp_path):
+    import urllib.request
+    from web_test.assist import mirror
+
+    snapshots = mirror.Snapshots(str(tmp_path))
+    snapshots.put('the-internet.herokuapp.com/', (200, 'text/html', b'home'))
+    snapshots.put('the-internet.herokuapp.com/?tab=1', (200, 'text/html', b'tab'))
+
+    with mirror.serving(str(tmp_path), 'replay') as server:
+        base_url = mirror.url('https://the-internet.herokuapp.com')
+        assert base_url + '/tables' == f'{server.origin}/the-internet.herokuapp.com/tables'
+        for url, body in [(base_url, b'home'), (mirror.url('https://the-internet.herokuapp.com?tab=1'), b'tab')]:
+            with urllib.request.urlopen(url) as response:
+                assert response.read() == body
+
+
+def test_mirror_replays_root_relative_subresources_of_recorded_pages(tmp_path):
+    import urllib.request
+    from web_test.assist import mirror
+
+    snapshots = mirror.Snapshots(str(tmp_path))
+    snapshots.put('the-internet.herokuapp.com/tables', (200, 'text/html', b'<link href="/x.css">'))
+    snapshots.put('the-internet.herokuapp.com/x.css', (200, 'text/css', b'table {}'))
+    snapshots.put('the-internet.herokuapp.com/favicon.ico', (200, 'image/x-icon', b'icon'))
+
+    with mirror.serving(str(tmp_path), 'replay') as server:
+        page = f'{server.origin}/the-internet.herokuapp.com/tables'
+        for path, body in [('/x.css', b'table {}'), ('/favicon.ico', b'icon')]:
+            request = urllib.request.Request(server.origin + path, headers={'Referer': page})
+            with urllib.request.urlopen(request) as response:
+                assert response.read() == body
+
+
+def test_key_codes_humanization():
+    from selenium.webdriver import Keys
+    from web_test.assist.selene.report import KeyCodes
+
+    assert KeyCodes.humanized(f'element(#q): press keys: {(Keys.ENTER,)}') == 'element(#q): press keys: ENTER'
+    assert KeyCodes.humanized(f'element(#q): type: {Keys.TAB}') == f'element(#q): type: {Keys.TAB}'
+    assert KeyCodes.humanized("element(#q): press keys: ('a',)") == "element(#q): press keys: ('a',)"
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import allure_commons
+
+from web_test.assist.selene import state
+from web_test.pages import the_internet
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+
+def test_browser_state_is_restored_instead_of_repeated_setup_flow(monkeypatch):
+    class Driver:
+        def __init__(self):
+            self.commands = []
+
+        def execute_script(self, script, *args):
+            self.commands.append(('script', *args))
+            return ['http://site/app', {'token': 'a'}, {'tab': 'b'}]
+
+        def get_cookies(self):
+            return [{'name': 'session', 'value': 'c'}]
+
+        def get(self, url):
+            self.commands.append(('get', url))
+
+        def delete_all_cookies(self):
+            self.commands.append(('delete cookies',))
+
+        def add_cookie(self, cookie):
+            self.commands.append(('add cookie', cookie['name']))
+
+    monkeypatch.setattr(state, 'enabled', True)
+    monkeypatch.setattr(state, '_snapshots', {})
+    flows = []
+
+    def login():
+        flows.append('login')
+
+    first, second = Driver(), Driver()
+    assert not state.set_up(first, 'logged in', login, key='admin')
+    assert state.set_up(second, 'logged in', login, key='admin')
+    assert flows == ['login']
+    assert second.commands == [
+        ('get', 'http://site/favicon.ico'),
+        ('delete cookies',),
+        ('add cookie', 'session'),
+        ('script', {'token': 'a'}, {'tab': 'b'}),
+        ('get', 'http://site/app'),
+    ]
+
+    assert not state.set_up(Driver(), 'logged in', login, key='user')
+    assert state.set_up(Driver(), 'logged in', login, key='admin')
+    assert state.set_up(Driver(), 'logged in', login, key='user')
+    assert flows == ['login'] * 2
+
+    state.invalidate('logged in')
+    assert not state.set_up(Driver(), 'logged in', login, key='user')
+    assert not state.set_up(Driver(), 'logged in', login, key='admin')
+    assert flows == ['login'] * 4
+
+
+def test_page_opened_after_setup_flow_is_titled_by_the_flow_name(monkeypatch):
+    class Listener:
+        titles = []
+
+        @allure_commons.hookimpl
+        def start_step(self, uuid, title, params):
+            self.titles.append(title)
+
+    monkeypatch.setattr(state, 'set_up', lambda driver, name, flow, key: None)
+    monkeypatch.setattr(the_internet, 'browser', SimpleNamespace(driver=None))
+    listener = Listener()
+    allure_commons.plugin_manager.register(listener)
+    try:
+        the_internet.PageWithModal().open_after('modal closed', lambda page: page.modal.close(), key=('admin', 1))
+    finally:
+        allure_commons.plugin_manager.unregister(listener)
+
+    assert listener.titles == [" PageWithModal: open after 'modal closed', key ('admin', 1)"]
@@ -0,0 +1,16 @@
+from web_test.assist.allure.report import _represented
+from web_test.test_markers import mark
+
+pytestmark = mark.tag.fast
+
+
+def test_step_params_representation_is_bounded():
+    assert _represented('short', 10) == ("'short'", False)
+    assert _represented('long' * 10, 10) == ("'longlonglo…'", True)
+    assert _represented("line1\nline2 'q' and more", 15) == ('"line1\\nline2 \'q\'…"', True)
+    assert _represented({'Last Name': 'Bach'}, 100) == ("{'Last Name': 'Bach'}", False)
+
+    representation, truncated = _represented({index: 'value' for index in range(10**6)}, 100)
+    assert truncated
+    assert len(representation) <= 101
+    assert representation.startswith("{0: 'value', 1: 'value'")
@@ -21,7 +21,23 @@
 # SOFTWARE.
 from __future__ import annotations
 
-from typing import List
+import functools
+import types
+from typing import Any, Callable, Dict, List, Mapping
+
+import pytest
+
+_snapshots = pytest.StashKey[Dict[type, Mapping[str, Any]]]()
+
+
+def _typed(value_type: type) -> Callable[[str], Any]:
+    """
+    converts the option value from command line string to the type of its default,
+    taking into account that bool('False') is True
+    """
+    if value_type is bool:
+        return lambda string: string.strip().lower() in ('true', 'yes', 'on', '1')
+    return value_type
 
 
 class Option:
@@ -55,6 +71,10 @@ class Option:
     def pytest_addoption(parser):
         Option.register_all(from_cls=project.Config, in_parser=parser)
 
+    # to pass resolved values to xdist workers instead of parsing them again there
+    def pytest_configure_node(node):
+        Option.share_with(node, from_cls=project.Config)
+
     @pytest.fixture
     def config(request):
         return project.Config(request)
@@ -64,9 +84,13 @@ class Option:
         browser.config.timeout = config.timeout
         # ...
 
+    Values of all options of the class are resolved on first access to any of them,
+    and then are read from the immutable snapshot stored per pytest session,
+    so they are cheap enough to be accessed even from per-step hooks.
     """
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def s_from(cls) -> List[Option]:
         return [Option.from_(field) for field in cls.__dict__.values()
                 if Option.in_(field)]
@@ -84,6 +108,39 @@ class Option:
         for option in Option.s_from(from_cls):
             option.register(in_parser)
 
+    @staticmethod
+    def snapshot(of_cls, config) -> Mapping[str, Any]:
+        """
+        returns the immutable values of all options of the class, resolved once per session,
+        either from the command line or, on xdist workers, from the controller's snapshot
+        """
+        snapshots = config.stash.setdefault(_snapshots, {})
+        if of_cls not in snapshots:
+            shared = getattr(config, 'workerinput', {}).get(Option._shared_key(of_cls))
+            snapshots[of_cls] = types.MappingProxyType(
+                shared if shared is not None
+                else {
+                    option.name: option.value(config)
+                    for cls in reversed(of_cls.__mro__)
+                    for option in Option.s_from(cls)
+                }
+            )
+        return snapshots[of_cls]
+
+    @staticmethod
+    def share_with(node, from_cls) -> None:
+        """
+        passes the snapshot to the xdist worker node via its workerinput,
+        should be called from the pytest_configure_node hook
+        """
+        node.workerinput[Option._shared_key(from_cls)] = dict(
+            Option.snapshot(from_cls, node.config)
+        )
+
+    @staticmethod
+    def _shared_key(cls) -> str:
+        return f'options_of_{cls.__module__}.{cls.__qualname__}'
+
     @staticmethod
     def default(value, **attributes):
         def decorator(fun_on_self_with_request):
@@ -91,11 +148,11 @@ class Option:
                 f'--{fun_on_self_with_request.__name__}',
                 action='store',
                 default=value,
-                type=type(value),
+                type=_typed(type(value)),
                 **attributes)
 
             def fun(self):
-                return option.value(self.request)
+                return Option.snapshot(type(self), self.request.config)[option.name]
 
             fun.option = option
 
@@ -107,8 +164,8 @@ class Option:
         self.name = name
         self.attributes = attributes
 
-    def value(self, from_request):
-        return from_request.settings.getoption(self.name)
+    def value(self, from_config):
+        return from_config.getoption(self.name)
 
     def register(self, parser):
         parser.addoption(self.name, **self.attributes)
@@ -2,6 +2,11 @@ from . import (
     allure,
     python,
     selene,
+    mirror,
+    impact,
+    reruns,
+    memory,
+    deadlines,
     webdriver_manager,
     project,
 )
@@ -1 +1 @@
-from . import report, aaa, gherkin
+from . import report, aaa, gherkin, coalescing
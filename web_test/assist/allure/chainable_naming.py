@@ -1,36 +1,109 @@
 import typing
+import weakref
 
-from selene.core.entity import WaitingEntity
+from selene.core.entity import Collection, Element, WaitingEntity
 
-T = typing.TypeVar("T", bound="ChainableNamingElement")
+T = typing.TypeVar("T", bound="SlottedChainableNamingElement")
 
 
-class ChainableNamingElement:
+_link_kinds: typing.Dict[type, typing.Optional[str]] = {}
+
+
+def _link_kind(cls: type) -> typing.Optional[str]:
     """
-    This class makes its children store their attribute names as a description and a link to a parent element.
-    Then it can be used to resolve chainable names like: "PreviewCodingLabPage.sidebar.show_hints_button"
+    'entity' for Selene entities, 'element' for chainable naming elements, None for values that are not linked,
+    resolved once per type, so assignments of plain values cost a dict lookup
+    """
+    try:
+        return _link_kinds[cls]
+    except KeyError:
+        if issubclass(cls, WaitingEntity):
+            kind = "entity"
+        elif issubclass(cls, SlottedChainableNamingElement):
+            kind = "element"
+        else:
+            kind = None
+        _link_kinds[cls] = kind
+        return kind
 
-    To use it, just inherit from this class (BasePage or BaseElement), and create a nested structure of attributes.
-    And then call get_full_path() for any nested attribute.
 
-    This class also works with Selene's elements, but it requires monkey patching.
+def _link(parent, key: str, value) -> None:
+    """Names the value by its attribute key (if it was not named yet) and links it to the parent."""
+    kind = _link_kind(type(value))
+    if kind is None:
+        return
+    if not getattr(value, "description", ""):
+        if kind == "entity":
+            value.as_(key)
+        else:
+            value.description = key
+    value.previous_name_chain_element = parent
+
+
+def _linking_setattr(self, key, value):
+    if key != "previous_name_chain_element":
+        _link(self, key, value)
+    object.__setattr__(self, key, value)
+
+
+class _LinkingSlot:
+    """
+    Wraps a slot member descriptor to link the assigned value to the instance,
+    so no __setattr__ override is needed for slotted classes.
     """
 
+    __slots__ = ("name", "member")
+
+    def __init__(self, name: str, member):
+        self.name = name
+        self.member = member
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return self.member.__get__(instance, owner)
+
+    def __set__(self, instance, value):
+        _link(instance, self.name, value)
+        self.member.__set__(instance, value)
+
+    def __delete__(self, instance):
+        self.member.__delete__(instance)
+
+
+class SlottedChainableNamingElement:
+    """
+    A compact variant of ChainableNamingElement for objects that are created in bulk, like table rows.
+
+    Its subclasses should declare their attributes in __slots__.
+    Each declared slot is wrapped once, at class definition, into a descriptor that names and links assigned
+    children, so instances have no __dict__ and plain attribute assignments stay as fast as possible.
+    Instances are weakref-able, so they can be kept in weak caches,
+    while the link to the parent is strong, so a child keeps its full name even if only the child is referenced,
+    like `PageWithModal().modal`.
+
+    Subclasses that do not declare __slots__ get a __dict__ back and link their children on each assignment,
+    the same way ChainableNamingElement does.
+    """
+
+    __slots__ = ("description", "previous_name_chain_element", "__weakref__")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        slots = cls.__dict__.get("__slots__", None)
+        if slots is None:
+            if cls.__setattr__ is object.__setattr__:
+                cls.__setattr__ = _linking_setattr
+            return
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name.startswith("__"):
+                continue
+            setattr(cls, name, _LinkingSlot(name, cls.__dict__[name]))
+
     def __init__(self):
         self.description = ""
         self.previous_name_chain_element = None
 
-    def __setattr__(self, key, value):
-        if isinstance(value, WaitingEntity):
-            if not getattr(value, "description", ""):
-                value.as_(key)
-            value.previous_name_chain_element = self
-        elif isinstance(value, ChainableNamingElement) and key != "previous_name_chain_element":
-            if not getattr(value, "description", ""):
-                value.description = key
-            value.previous_name_chain_element = self
-        super().__setattr__(key, value)
-
     def __str__(self):
         return self.description or self.__class__.__name__
 
@@ -39,7 +112,7 @@ class ChainableNamingElement:
         return result
 
     def resolve_name(self) -> list:
-        if self.previous_name_chain_element:
+        if self.previous_name_chain_element is not None:
             name = self.previous_name_chain_element.resolve_name()
         else:
             name = []
@@ -53,3 +126,105 @@ class ChainableNamingElement:
     def set_previous_name_chain_element(self: T, previous_element: T | WaitingEntity) -> T:
         self.previous_name_chain_element = previous_element
         return self
+
+
+class ChainableNamingElement(SlottedChainableNamingElement):
+    """
+    This class makes its children store their attribute names as a description and a link to a parent element.
+    Then it can be used to resolve chainable names like: "PreviewCodingLabPage.sidebar.show_hints_button"
+
+    To use it, just inherit from this class (BasePage or BaseElement), and create a nested structure of attributes.
+    And then call get_full_path() for any nested attribute.
+
+    This class also works with Selene's elements, but it requires monkey patching.
+    """
+
+    def __setattr__(self, key, value):
+        _linking_setattr(self, key, value)
+
+
+V = typing.TypeVar("V")
+
+
+class Child(typing.Generic[V]):
+    """
+    Declares a child of a chainable naming element, that is built lazily, e.g.:
+
+        class PageWithModal(BasePage):
+            modal = Child(lambda page: Modal())
+
+    The factory is called with the owner instance on first access,
+    then the built child is named by the attribute name, linked to the owner
+    and cached per owner instance, so nothing is built until it is really used.
+    """
+
+    def __init__(self, factory: typing.Callable[[typing.Any], V]):
+        self.factory = factory
+        self.name = None
+        self._children_of_slotted = weakref.WeakKeyDictionary()
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None) -> V:
+        if instance is None:
+            return self
+        instance_dict = getattr(instance, "__dict__", None)
+        if instance_dict is None:
+            # children link their owners strongly, so they are cached weakly, to not keep the owners alive,
+            # and are built again if nothing else holds them
+            child_ref = self._children_of_slotted.get(instance)
+            child = child_ref() if child_ref is not None else None
+            if child is None:
+                child = self._build_for(instance)
+                self._children_of_slotted[instance] = weakref.ref(child)
+            return child
+        # being a non-data descriptor, this one will be shadowed by the cached value on all further accesses
+        instance_dict[self.name] = child = self._build_for(instance)
+        return child
+
+    def _build_for(self, instance) -> V:
+        child = self.factory(instance)
+        _link(instance, self.name, child)
+        return child
+
+
+Selector = str | typing.Tuple[str, str]
+
+
+def _search_context(instance, of: typing.Optional[str]):
+    if of:
+        return getattr(instance, of)
+    from web_test.assist.selene.context import browser
+
+    return browser
+
+
+def _selector(instance, selector: Selector | typing.Callable[[typing.Any], Selector]) -> Selector:
+    return selector(instance) if callable(selector) else selector
+
+
+class Component(Child[Element]):
+    """
+    Declares a lazy Selene element, e.g.:
+
+        class Modal(BaseElement):
+            _container = Component('.modal')
+            header = Component('.modal-title', of='_container')
+
+    Args:
+        selector (): css or xpath or by, or a function from the owner instance to one of them
+        of (): attribute name of the owner's element to search in (the browser by default)
+    """
+
+    def __init__(self, selector: Selector | typing.Callable[[typing.Any], Selector], of: typing.Optional[str] = None):
+        super().__init__(lambda instance: _search_context(instance, of).element(_selector(instance, selector)))
+
+
+class Components(Child[Collection]):
+    """
+    Same as Component but declares a lazy Selene collection of elements.
+    """
+
+    def __init__(self, selector: Selector | typing.Callable[[typing.Any], Selector], of: typing.Optional[str] = None):
+        super().__init__(lambda instance: _search_context(instance, of).all(_selector(instance, selector)))
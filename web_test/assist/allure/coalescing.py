@@ -0,0 +1,125 @@
+"""
+Coalescing of repetitive nested steps in allure results.
+
+Table lookups and data driven checks produce long runs of sibling steps
+that differ only in literals, like `element(('xpath', './/td[1]')): should have no exact text ''`
+for each cell of each row, so reports of big tests have tens of thousands of steps,
+and are slow to write and to open.
+
+Before a test result (or a fixture's one) is written, the coalescer replaces each run
+of at least `min_run` consecutive sibling steps of the same template (the title with quoted strings
+and numbers masked), that passed completely (with all their nested steps), and have no attachments,
+by one step named by the first title with only differing literals masked,
+with the count and timing summary in its params, keeping the first step of the run in full as an example inside.
+Failed or broken steps, steps with failed nested ones, and steps with attachments,
+break the runs, so they and their parents are kept as is, in full detail.
+
+Usually the coalescer is registered in conftest.py if enabled via config.settings.step_coalesce_min_run
+"""
+import itertools
+import re
+from typing import List, Optional, Set
+
+import allure_commons
+from allure_commons.model2 import ExecutableItem, Parameter, Status, TestStepResult
+
+_QUOTED = re.compile(r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*\"""")
+_NUMBERS = re.compile(r'\d+')
+_LITERALS = re.compile(f'{_QUOTED.pattern}|{_NUMBERS.pattern}')
+
+
+def _masked(literals: Set[str]) -> str:
+    """
+    the same literal as is, otherwise numbers masked if only they differ, otherwise the whole literal
+    """
+    if len(literals) == 1:
+        return next(iter(literals))
+    with_masked_numbers = {_NUMBERS.sub('#', literal) for literal in literals}
+    if len(with_masked_numbers) == 1:
+        return next(iter(with_masked_numbers))
+    quote = next(iter(literals))[0]
+    return f'{quote}…{quote}'
+
+
+def template_of(title: Optional[str]) -> str:
+    """
+    the title with literals masked, e.g. `td[1] has text 'Doe'` -> `td[#] has text '…'`
+    """
+    return _QUOTED.sub(lambda quoted: f'{quoted[0][0]}…{quoted[0][0]}', _NUMBERS.sub('#', title or ''))
+
+
+def _common_title(titles: List[str]) -> str:
+    """
+    the first title with masked only those literals (or only numbers in them) that differ between the titles
+    """
+    literals = list(zip(*(_LITERALS.findall(title) for title in titles)))
+    positions = itertools.count()
+    return _LITERALS.sub(lambda _: _masked(set(literals[next(positions)])), titles[0])
+
+
+def _intact(step: ExecutableItem) -> bool:
+    """
+    passed with all nested steps, and has nothing attached, so nothing is lost if coalesced
+    """
+    return step.status == Status.PASSED and not step.attachments and all(_intact(child) for child in step.steps)
+
+
+def _duration_ms(step: ExecutableItem) -> int:
+    return (step.stop or 0) - (step.start or 0)
+
+
+def _merged(run: List[ExecutableItem]) -> TestStepResult:
+    durations = [_duration_ms(step) for step in run]
+    first, last = run[0], run[-1]
+    return TestStepResult(
+        name=f'{_common_title([step.name or "" for step in run])} ×{len(run)}',
+        status=Status.PASSED,
+        stage=first.stage,
+        start=first.start,
+        stop=last.stop,
+        steps=[first],
+        parameters=[
+            Parameter(name='steps', value=str(len(run))),
+            Parameter(name='total', value=f'{sum(durations)}ms'),
+            Parameter(name='min/avg/max', value=f'{min(durations)}/{sum(durations) // len(run)}/{max(durations)}ms'),
+        ],
+    )
+
+
+def coalesced(steps: List[ExecutableItem], min_run: int) -> List[ExecutableItem]:
+    """
+    the steps with runs of alike ones merged, recursively into intact steps only
+    """
+    result: List[ExecutableItem] = []
+    run: List[ExecutableItem] = []
+
+    def flush():
+        result.extend([_merged(run)] if len(run) >= min_run else run)
+        run.clear()
+
+    for step in steps:
+        if not _intact(step):
+            # failed or broken steps, or their parents, are kept in full detail, down to their passed children
+            flush()
+            result.append(step)
+            continue
+        step.steps = coalesced(step.steps, min_run)
+        if run and template_of(step.name) != template_of(run[0].name):
+            flush()
+        run.append(step)
+    flush()
+    return result
+
+
+class Coalescer:
+    def __init__(self, min_run: int = 3):
+        self.min_run = min_run
+
+    @allure_commons.hookimpl(tryfirst=True)
+    def report_result(self, result):
+        result.steps = coalesced(result.steps, self.min_run)
+
+    @allure_commons.hookimpl(tryfirst=True)
+    def report_container(self, container):
+        for fixture in [*container.befores, *container.afters]:
+            fixture.steps = coalesced(fixture.steps, self.min_run)
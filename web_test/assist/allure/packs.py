@@ -0,0 +1,209 @@
+"""
+Compaction of allure results into a few indexed pack files, and their expansion back.
+
+With `--alluredir=reports -n auto`, each worker writes lots of small *-result.json, *-container.json
+and attachment files, so serving the report, or copying the results between CI stages, spends a lot of time
+just on scanning and opening files. Compacted, the results are stored as:
+
+    <packs dir>/index.json      names of all files, by hashes of their contents
+    <packs dir>/pack-<n>.bin    zlib compressed contents, each stored once, at offsets listed in the index
+
+where identical files (like the same screenshot attached by different tests) are stored once,
+contents are distributed between packs by size, and packs are written and read in parallel processes.
+Being expanded back, the files are the standard allure results again, duplicates are hard links if possible.
+
+Usage:
+
+    python -m web_test.assist.allure.packs compact reports reports.packed [number of packs, cpu count by default]
+    python -m web_test.assist.allure.packs expand reports.packed reports
+
+(see run/compact_reports.sh and run/expand_reports.sh)
+"""
+import concurrent.futures
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+INDEX = 'index.json'
+
+Blob = Tuple[int, int, int, int]
+"""
+pack number, offset and length of compressed content in the pack, and the original size
+"""
+
+
+class Summary(NamedTuple):
+    files: int
+    unique: int
+    bytes_before: int
+    bytes_after: int
+    packs: int
+    seconds: float
+    scan_seconds_before: float
+    scan_seconds_after: float
+
+    def __str__(self):
+        saved = self.bytes_before - self.bytes_after
+        return (
+            f'{self.files} files ({self.files - self.unique} duplicates) compacted into {self.packs} packs '
+            f'in {self.seconds:.2f}s\n'
+            f'bytes: {self.bytes_before} -> {self.bytes_after}, '
+            f'saved {saved} ({saved / self.bytes_before:.0%})\n'
+            f'scanning: {self.scan_seconds_before:.3f}s -> {self.scan_seconds_after:.3f}s, '
+            f'saved {self.scan_seconds_before - self.scan_seconds_after:.3f}s'
+            if self.bytes_before
+            else 'nothing to compact'
+        )
+
+
+def _scanned(directory: Path) -> Tuple[List[Path], float]:
+    """
+    all files in the directory and the time to scan them as allure would do, i.e. with stat of each
+    """
+    started = time.perf_counter()
+    files = sorted(path for path in directory.rglob('*') if path.is_file())
+    for path in files:
+        path.stat()
+    return files, time.perf_counter() - started
+
+
+def _hashed(path: Path) -> Tuple[str, int]:
+    content = path.read_bytes()
+    return hashlib.sha1(content).hexdigest(), len(content)
+
+
+def _packed(pack: Path, sources: List[Tuple[str, str]]) -> Dict[str, Tuple[int, int]]:
+    """
+    writes compressed contents of the sources (hash and path pairs) into the pack,
+    returns offsets and lengths of them by hashes
+    """
+    located = {}
+    with pack.open('wb') as file:
+        for content_hash, path in sources:
+            compressed = zlib.compress(Path(path).read_bytes())
+            located[content_hash] = (file.tell(), len(compressed))
+            file.write(compressed)
+    return located
+
+
+def _distributed(sizes: Dict[str, int], packs: int) -> List[List[str]]:
+    """
+    hashes distributed between packs so each pack gets about the same size, the largest ones first
+    """
+    distributed: List[List[str]] = [[] for _ in range(packs)]
+    totals = [0] * packs
+    for content_hash in sorted(sizes, key=sizes.get, reverse=True):
+        smallest = totals.index(min(totals))
+        distributed[smallest].append(content_hash)
+        totals[smallest] += sizes[content_hash]
+    return [hashes for hashes in distributed if hashes]
+
+
+def compact(results: str | Path, packs_dir: str | Path, packs: Optional[int] = None) -> Summary:
+    """
+    compacts all files of the allure results directory into packs_dir (replacing its previous contents),
+    the results directory is kept as is
+    """
+    started = time.perf_counter()
+    results, packs_dir = Path(results), Path(packs_dir)
+    packs = packs or os.cpu_count() or 1
+    files, scan_seconds_before = _scanned(results)
+
+    with concurrent.futures.ThreadPoolExecutor() as threads:
+        hashed = list(threads.map(_hashed, files))
+    names = {path.relative_to(results).as_posix(): content_hash for path, (content_hash, _) in zip(files, hashed)}
+    sources = {content_hash: str(path) for path, (content_hash, _) in zip(files, hashed)}
+    sizes = {content_hash: size for content_hash, size in hashed}
+
+    if packs_dir.exists():
+        shutil.rmtree(packs_dir)
+    packs_dir.mkdir(parents=True)
+    distributed = _distributed(sizes, packs)
+    blobs: Dict[str, Blob] = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=len(distributed) or 1) as processes:
+        futures = [
+            processes.submit(
+                _packed,
+                packs_dir / f'pack-{number}.bin',
+                [(content_hash, sources[content_hash]) for content_hash in hashes],
+            )
+            for number, hashes in enumerate(distributed)
+        ]
+        for number, future in enumerate(futures):
+            for content_hash, (offset, length) in future.result().items():
+                blobs[content_hash] = (number, offset, length, sizes[content_hash])
+
+    (packs_dir / INDEX).write_text(json.dumps({'packs': len(distributed), 'blobs': blobs, 'files': names}))
+
+    packed, scan_seconds_after = _scanned(packs_dir)
+    return Summary(
+        files=len(files),
+        unique=len(sizes),
+        bytes_before=sum(size for _, size in hashed),
+        bytes_after=sum(path.stat().st_size for path in packed),
+        packs=len(distributed),
+        seconds=time.perf_counter() - started,
+        scan_seconds_before=scan_seconds_before,
+        scan_seconds_after=scan_seconds_after,
+    )
+
+
+def _unpacked(pack: Path, blobs: List[Tuple[int, int, List[str]]], results: Path) -> None:
+    """
+    writes contents from the pack (offset, length and names of each) to the first of names, links others to it
+    """
+    with pack.open('rb') as file:
+        for offset, length, names in blobs:
+            file.seek(offset)
+            content = zlib.decompress(file.read(length))
+            first = results / names[0]
+            first.parent.mkdir(parents=True, exist_ok=True)
+            first.write_bytes(content)
+            for name in names[1:]:
+                duplicate = results / name
+                duplicate.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(first, duplicate)
+                except OSError:
+                    duplicate.write_bytes(content)
+
+
+def expand(packs_dir: str | Path, results: str | Path) -> int:
+    """
+    expands the packs back into standard allure results (replacing previous ones), returns the number of files
+    """
+    packs_dir, results = Path(packs_dir), Path(results)
+    index = json.loads((packs_dir / INDEX).read_text())
+    names_by_hash: Dict[str, List[str]] = {}
+    for name, content_hash in index['files'].items():
+        names_by_hash.setdefault(content_hash, []).append(name)
+    by_pack: List[List[Tuple[int, int, List[str]]]] = [[] for _ in range(index['packs'])]
+    for content_hash, (number, offset, length, _) in index['blobs'].items():
+        by_pack[number].append((offset, length, names_by_hash[content_hash]))
+
+    if results.exists():
+        shutil.rmtree(results)
+    results.mkdir(parents=True)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=index['packs'] or 1) as processes:
+        for future in [
+            processes.submit(_unpacked, packs_dir / f'pack-{number}.bin', blobs, results)
+            for number, blobs in enumerate(by_pack)
+        ]:
+            future.result()
+    return len(index['files'])
+
+
+if __name__ == '__main__':
+    command, source, target, *packs_count = sys.argv[1:]
+    if command == 'compact':
+        print(compact(source, target, int(packs_count[0]) if packs_count else None))
+    elif command == 'expand':
+        print(f'{expand(source, target)} files expanded')
+    else:
+        sys.exit(f'unknown command: {command}, should be compact or expand')
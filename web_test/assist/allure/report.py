@@ -1,16 +1,142 @@
+import builtins
 import collections
 import inspect
+import itertools
 import re
+import reprlib
 from functools import reduce, wraps
-from typing import TypeVar, Callable, Any
+from typing import TypeVar, Callable, Any, Optional, Tuple
 
 from allure_commons import plugin_manager
+from allure_commons._allure import attach
+from allure_commons.types import AttachmentType
 from allure_commons.utils import represent, uuid4
 
-from web_test.assist.allure.chainable_naming import ChainableNamingElement
+from web_test.assist.allure.chainable_naming import SlottedChainableNamingElement
 
 _TFunc = TypeVar("_TFunc", bound=Callable[..., Any])
 
+max_param_length = 200
+"""
+step params longer than this are truncated in step titles and params, see _represented below
+"""
+attach_params_longer_than: Optional[int] = None
+"""
+truncated step params with full representation longer than this are attached to the step in full,
+None to never attach them
+"""
+
+_TRUNCATED = "…"
+"""
+the marker of a truncated param representation
+"""
+
+
+class _BoundedRepr(reprlib.Repr):
+    """
+    Represents a value in about max_length characters, without representing all items of big collections,
+    and remembers whether anything was truncated.
+    """
+
+    _MAX_ITEMS = {
+        "tuple": "maxtuple",
+        "list": "maxlist",
+        "dict": "maxdict",
+        "set": "maxset",
+        "frozenset": "maxfrozenset",
+        "deque": "maxdeque",
+    }
+
+    def __init__(self, max_length: int):
+        super().__init__()
+        self.maxstring = self.maxlong = self.maxother = max_length
+        self.maxtuple = self.maxlist = self.maxdict = self.maxset = self.maxfrozenset = self.maxdeque = max(
+            4, max_length // 10
+        )
+        self.maxlevel = 4
+        self.truncated = False
+
+    def repr1(self, x, level):
+        max_items = self._MAX_ITEMS.get(type(x).__name__)
+        if max_items and len(x) and (level <= 0 or len(x) > getattr(self, max_items)):
+            self.truncated = True
+        return super().repr1(x, level)
+
+    def repr_str(self, x, level):
+        if len(builtins.repr(x[: self.maxstring])) > self.maxstring:
+            self.truncated = True
+        return super().repr_str(x, level)
+
+    def repr_instance(self, x, level):
+        try:
+            result = builtins.repr(x)
+        except Exception:
+            return super().repr_instance(x, level)
+        if len(result) > self.maxother:
+            self.truncated = True
+            return result[: self.maxother] + _TRUNCATED
+        return result
+
+    repr_int = repr_instance
+
+    # unlike reprlib, dicts and sets are not sorted, to not sort all items for a few of them,
+    # and dicts are represented in insertion order, like by repr
+
+    def repr_dict(self, x, level):
+        if not x:
+            return "{}"
+        if level <= 0:
+            return "{" + self.fillvalue + "}"
+        pieces = [
+            f"{self.repr1(key, level - 1)}: {self.repr1(value, level - 1)}"
+            for key, value in itertools.islice(x.items(), self.maxdict)
+        ]
+        if len(x) > self.maxdict:
+            pieces.append(self.fillvalue)
+        return "{" + ", ".join(pieces) + "}"
+
+    def repr_set(self, x, level):
+        return self._repr_iterable(x, level, "{", "}", self.maxset) if x else "set()"
+
+    def repr_frozenset(self, x, level):
+        return self._repr_iterable(x, level, "frozenset({", "})", self.maxfrozenset) if x else "frozenset()"
+
+
+def _represented(value, max_length: int) -> Tuple[str, bool]:
+    """
+    returns the representation of the value (same as allure's represent for short values),
+    bounded by about max_length characters, and whether it was truncated
+    """
+    if isinstance(value, str):
+        if len(value) <= max_length:
+            return represent(value), False
+        # escaped, so a long multiline value does not break the step title, with the mark inside the quotes
+        head = repr(value[:max_length])
+        return f"{head[:-1]}{_TRUNCATED}{head[-1]}", True
+    if isinstance(value, (bytes, bytearray)):
+        return represent(value), False
+
+    bounded = _BoundedRepr(max_length)
+    result = bounded.repr(value)
+    if len(result) > max_length:
+        return result[:max_length] + _TRUNCATED, True
+    return result, bounded.truncated
+
+
+def _attach_in_full(values: dict) -> None:
+    for name, value in values.items():
+        full = represent(value)
+        if len(full) > attach_params_longer_than:
+            attach(full, name=f"{name} (full value)", attachment_type=AttachmentType.TEXT)
+
+
+def _is_reported() -> bool:
+    """
+    whether any allure listener is registered, otherwise steps are not reported at all (e.g. without --alluredir)
+    """
+    return bool(plugin_manager.hook.start_step.get_hookimpls())
+
+
 def _humanify(string_with_underscores, /):
     return re.sub(r"_+", " ", string_with_underscores).strip()  # todo: improve ;)
 
@@ -45,7 +171,7 @@ def _fn_params_to_ordered_dict(func, *args, **kwargs):
     }.items()
 
     sorted_items = sorted(
-        map(lambda kv: (kv[0], represent(kv[1])), items),
+        items,
         key=lambda x: pos_or_named_or_vargs_or_named_only_ordered_names.index(x[0]),
     )
 
@@ -121,8 +247,16 @@ class StepContext:
         def impl(*args, **kw):
             __tracebackhide__ = True
 
+            if not _is_reported():
+                return func(*args, **kw)
+
             # params_dict = func_parameters(func, *args, **kw)
-            params_dict = _fn_params_to_ordered_dict(func, *args, **kw)
+            params_dict = collections.OrderedDict()
+            truncated_values = {}
+            for param_name, value in _fn_params_to_ordered_dict(func, *args, **kw).items():
+                params_dict[param_name], truncated = _represented(value, max_param_length)
+                if truncated and attach_params_longer_than is not None:
+                    truncated_values[param_name] = value
 
             def described(item):
                 (name, value) = item
@@ -172,7 +306,7 @@ class StepContext:
                 class_name = instance and instance.__class__.__name__
 
                 chainable_element_name = None
-                if isinstance(instance, ChainableNamingElement):
+                if isinstance(instance, SlottedChainableNamingElement):
                     chainable_element_name = instance.get_full_path()
                 context_name = chainable_element_name or maybe_module_name or maybe_instance_name or class_name
 
@@ -194,6 +328,7 @@ class StepContext:
             )
 
             with StepContext(translated_name, params_dict):
+                _attach_in_full(truncated_values)
                 return func(*args, **kw)
 
             # todo: consider supporting the following original params rendering
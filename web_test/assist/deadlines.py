@@ -0,0 +1,217 @@
+"""
+Deadline budgets of tests and of the whole session, consulted by waits.
+
+config.settings.timeout bounds a single wait, but a test with hundreds of waits against a degraded page
+can run for tens of minutes before it fails, blocking an xdist worker all that time.
+With deadlines:
+- each test gets a budget of seconds since its setup started,
+  from the `deadline(seconds)` marker (see mark.deadline), or from the default for all tests;
+- the session (of the xdist worker if run in parallel) gets a budget of seconds since its start;
+- each wait (see web_test.assist.selene.report.wait_with) is shortened to what is left of the budgets;
+- fixture teardowns are not limited, so cleanup of a passed test does not fail on the suite budget;
+- once a budget is exhausted, the current wait and the rest of the test fail fast,
+  and tests after the exhausted session budget fail at setup,
+  with the report of where the time went: in which waits (alike ones grouped) and outside of them.
+
+Usually the deadlines are registered in conftest.py with values from config.settings.deadline_*
+"""
+import contextlib
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import pytest
+
+from web_test.assist.allure.coalescing import template_of
+
+MARKER = 'deadline'
+
+
+class Budget:
+    def __init__(self, name: str, seconds: float):
+        self.name = name
+        self.seconds = seconds
+        self.started = time.monotonic()
+
+    @property
+    def spent(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def left(self) -> float:
+        return self.seconds - self.spent
+
+
+class Deadlines:
+    def __init__(self, *, test_seconds: Optional[float], suite_seconds: Optional[float], top: int = 5):
+        self.test_seconds = test_seconds
+        self.suite_seconds = suite_seconds
+        self.top = top
+        self.suite: Optional[Budget] = None
+        self.test: Optional[Budget] = None
+        self.waits: Dict[str, List[float]] = {}
+        """
+        durations of outermost waits of the current test by their templates
+        """
+        self.tests: Dict[str, float] = {}
+        """
+        durations of finished tests by their ids
+        """
+        self._depth = 0
+        self._suspended = 0
+        self._tearing_down = False
+        self._current = ''
+        self._started = 0.0
+        self._failed_by_suite = 0
+        self._report: List[str] = []
+
+    # --- reporting ---
+
+    def _where_the_time_went(self, budget: Budget) -> str:
+        lines = [f'{budget.name} deadline of {budget.seconds:g}s is exhausted, {budget.spent:.1f}s spent:']
+        if budget is self.suite:
+            slowest = sorted(self.tests.items(), key=lambda item: item[1], reverse=True)[: self.top]
+            lines += [f'  {seconds:.1f}s in {test}' for test, seconds in slowest]
+            lines += [f'  ({len(self.tests)} tests finished)']
+            return '\n'.join(lines)
+        slowest = sorted(self.waits.items(), key=lambda item: sum(item[1]), reverse=True)
+        lines += [
+            f'  {sum(durations):.1f}s in {len(durations)} waits for: {template}'
+            for template, durations in slowest[: self.top]
+        ]
+        if len(slowest) > self.top:
+            rest = [duration for _, durations in slowest[self.top :] for duration in durations]
+            lines += [f'  {sum(rest):.1f}s in {len(rest)} other waits']
+        in_waits = sum(sum(durations) for durations in self.waits.values())
+        lines += [f'  {budget.spent - in_waits:.1f}s outside of waits']
+        return '\n'.join(lines)
+
+    def _fail_if_exhausted(self, reason: Optional[Exception] = None) -> None:
+        exhausted = next((budget for budget in (self.test, self.suite) if budget and budget.left <= 0), None)
+        if exhausted is None:
+            return
+        report = self._where_the_time_went(exhausted)
+        headline = report.splitlines()[0].rstrip(':')
+        if exhausted is self.test:
+            self._report.append(f'deadlines: {self._current}: {headline}')
+        elif not self._failed_by_suite:
+            self._report.append(f'deadlines: {headline}, the rest of tests failed fast')
+        self._failed_by_suite += exhausted is self.suite
+        pytest.fail(report + (f'\n\nwhile waiting: {reason}' if reason else ''), pytrace=False)
+
+    # --- waiting ---
+
+    @contextlib.contextmanager
+    def waiting(self, wait: Any, title: str) -> Iterator[Optional[float]]:
+        """
+        provides what is left of the budgets for the wait to be shortened to (None if nothing limits it),
+        fails fast once they are exhausted
+        """
+        budgets = [
+            budget
+            for budget in (self.test, self.suite)
+            if budget is not None and not self._suspended and not self._tearing_down
+        ]
+        if not budgets:
+            yield None
+            return
+        self._fail_if_exhausted()
+        self._depth += 1
+        started = time.monotonic()
+        failure = None
+        try:
+            yield min(budget.left for budget in budgets)
+        except Exception as reason:
+            failure = reason
+            raise
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.waits.setdefault(template_of(title), []).append(time.monotonic() - started)
+            if failure is not None:
+                self._fail_if_exhausted(failure)
+
+    @contextlib.contextmanager
+    def suspended(self) -> Iterator[None]:
+        """
+        for things that only look like waits, e.g. replaying steps of waits that are already over
+        """
+        self._suspended += 1
+        try:
+            yield
+        finally:
+            self._suspended -= 1
+
+    # --- session ---
+
+    def pytest_sessionstart(self, session):
+        if self.suite_seconds:
+            self.suite = Budget('suite', self.suite_seconds)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        output = getattr(node, 'workeroutput', {}).get('deadlines')
+        if output is not None:
+            self._report.extend(output['report'])
+            self._failed_by_suite += output['failed_by_suite']
+
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(session.config, 'workeroutput', None)
+        if workeroutput is not None:
+            workeroutput['deadlines'] = {'report': self._report, 'failed_by_suite': self._failed_by_suite}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item: pytest.Item):
+        marker = item.get_closest_marker(MARKER)
+        seconds = marker.args[0] if marker is not None else self.test_seconds
+        self.test = Budget('test', seconds) if seconds else None
+        self.waits = {}
+        self._depth = 0
+        self._tearing_down = False
+        self._current = item.nodeid
+        self._started = time.monotonic()
+        self._fail_if_exhausted()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_teardown(self, item: pytest.Item):
+        """
+        the test is over, so its teardown is limited neither by its budget,
+        nor by the suite one, to not turn a passed test into an error on cleanup
+        """
+        self.tests[item.nodeid] = time.monotonic() - self._started
+        self.test = None
+        self._tearing_down = True
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self._report and not self._failed_by_suite:
+            return
+        terminalreporter.write_sep('-', 'deadlines')
+        for line in self._report:
+            terminalreporter.write_line(line)
+        if self._failed_by_suite:
+            terminalreporter.write_line(f'deadlines: {self._failed_by_suite} tests failed by the suite deadline')
+
+
+_active: Optional[Deadlines] = None
+
+
+def activate(deadlines: Optional[Deadlines]) -> None:
+    global _active
+    _active = deadlines
+
+
+@contextlib.contextmanager
+def waiting(wait: Any, title: str) -> Iterator[Optional[float]]:
+    if _active is None:
+        yield None
+        return
+    with _active.waiting(wait, title) as left:
+        yield left
+
+
+@contextlib.contextmanager
+def suspended() -> Iterator[None]:
+    if _active is None:
+        yield
+        return
+    with _active.suspended():
+        yield
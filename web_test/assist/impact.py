@@ -0,0 +1,239 @@
+"""
+Test impact selection: run only tests affected by changes since the last recorded run.
+
+In 'record' mode, the plugin traces which project functions (page objects,
+their report.step-decorated methods, fixtures, test functions themselves, etc.)
+were executed by each test, and saves this as a dependency index, like:
+
+    {
+      "commit": "<HEAD at the moment of recording>",
+      "tests": {
+        "tests/test_x.py::test_y": {
+          "web_test/pages/the_internet.py": [["Table.cell", 80, 84], ...],
+          ...
+        }
+      }
+    }
+
+In 'select' mode, the plugin takes `git diff` of the working tree against the recorded commit,
+and keeps only tests that executed changed lines, plus tests that are not in the index yet,
+plus the safety set of tests marked by mark.suite.smoke.
+Changes outside functions (imports, class attributes, etc.) affect all tests that executed
+anything from the changed module, and changes in files unknown to the index
+(except docs) affect all tests.
+
+The index is supposed to be recorded on full runs, e.g. nightly on the main branch, via
+
+    env -S "impact=record" pytest tests
+
+Usually the plugin is registered in conftest.py according to config.settings.impact
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Literal, Optional, Set, Tuple
+
+import pytest
+
+Mode = Literal['off', 'record', 'select']
+
+Function = Tuple[str, int, int]
+"""
+qualified name, first and last line of an executed function
+"""
+
+Dependencies = Dict[str, List[Function]]
+"""
+executed functions by project relative paths of their modules
+"""
+
+Changes = Dict[str, Optional[List[Tuple[int, int]]]]
+"""
+changed line ranges (as of the base commit) by project relative paths,
+None if the whole file is considered changed
+"""
+
+_IGNORED_CHANGES = re.compile(r'(^docs/|^run/|^LICENSE$|\.(md|rst|txt)$)')
+_HUNK = re.compile(r'^@@ -(\d+)(?:,(\d+))? ')
+
+
+class Recorder:
+    """
+    Traces calls of python functions defined in project files
+    (excluding installed packages, e.g. in a virtualenv inside the project)
+    """
+
+    def __init__(self, root: Path):
+        self._root = str(root) + os.sep
+        self._functions: Dict[object, Optional[Tuple[str, Function]]] = {}
+        self.executed: Set[Tuple[str, Function]] = set()
+
+    def _function_of(self, code) -> Optional[Tuple[str, Function]]:
+        filename = code.co_filename
+        if not filename.startswith(self._root) or 'site-packages' in filename or code.co_name == '<module>':
+            return None
+        last = max((line for *_, line in code.co_lines() if line is not None), default=code.co_firstlineno)
+        path = Path(filename[len(self._root):]).as_posix()
+        return path, (getattr(code, 'co_qualname', code.co_name), code.co_firstlineno, last)
+
+    def _trace(self, frame, event, arg):
+        code = frame.f_code
+        if code not in self._functions:
+            self._functions[code] = self._function_of(code)
+        function = self._functions[code]
+        if function is not None:
+            self.executed.add(function)
+        # no local tracing, only calls are of interest
+        return None
+
+    def __enter__(self):
+        self.executed = set()
+        sys.settrace(self._trace)
+        threading.settrace(self._trace)
+        return self
+
+    def __exit__(self, *_):
+        sys.settrace(None)
+        threading.settrace(None)
+
+    def dependencies(self) -> Dependencies:
+        result: Dependencies = {}
+        for path, function in sorted(self.executed):
+            result.setdefault(path, []).append(function)
+        return result
+
+
+def _git(root: Path, *args: str) -> str:
+    return subprocess.run(
+        ['git', *args], cwd=root, capture_output=True, text=True, check=True
+    ).stdout
+
+
+def changes_since(commit: str, root: Path) -> Changes:
+    """
+    parses `git diff` of the working tree against the commit
+    """
+    changes: Changes = {}
+    path = None
+    for line in _git(root, 'diff', '-U0', '--no-color', '--no-ext-diff', '--no-renames', commit).splitlines():
+        if line.startswith('diff --git '):
+            path = line.split(' b/', 1)[0][len('diff --git a/'):]
+            changes[path] = None
+        elif line.startswith('new file mode'):
+            # a new module can affect tests only via changes in modules that use it, except a new conftest
+            if Path(path).name != 'conftest.py':
+                del changes[path]
+            path = None
+        elif path and (hunk := _HUNK.match(line)):
+            start, count = int(hunk[1]), int(hunk[2] or 1)
+            # a pure insertion (count == 0) goes between the start line and the next one
+            end = start + count - 1 if count else start + 1
+            changes[path] = (changes[path] or []) + [(start, end)]
+    return changes
+
+
+def affected(tests: Dict[str, Dependencies], changes: Changes) -> Optional[Set[str]]:
+    """
+    returns ids of the tests affected by changes, or None if all of them should be run
+    """
+    result = set()
+    for path, ranges in changes.items():
+        users = {test: dependencies[path] for test, dependencies in tests.items() if path in dependencies}
+        if not users:
+            if _IGNORED_CHANGES.search(path) or (
+                path.startswith('tests/') and Path(path).name.startswith('test_')
+            ):
+                # new tests in the changed test module are not in the index, so will be run anyway
+                continue
+            return None
+        if ranges is None:
+            result |= users.keys()
+            continue
+        known = {function for functions in users.values() for function in functions}
+        for start, end in ranges:
+            if not any(first <= start and end <= last for _, first, last in known):
+                # a change on module or class level, e.g. a locator of page element
+                result |= users.keys()
+                break
+            result |= {
+                test
+                for test, functions in users.items()
+                if any(first <= end and start <= last for _, first, last in functions)
+            }
+    return result
+
+
+class Plugin:
+    def __init__(self, mode: Mode, index: str | Path, root: Path):
+        self.mode = mode
+        self.index = Path(index)
+        self.root = root
+        self.recorded: Dict[str, Dependencies] = {}
+        self._report: List[str] = []
+
+    # --- record ---
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        if self.mode != 'record':
+            yield
+            return
+        with Recorder(self.root) as recorder:
+            yield
+        self.recorded[item.nodeid] = recorder.dependencies()
+
+    def pytest_sessionfinish(self, session):
+        if self.mode != 'record':
+            return
+        self.index.parent.mkdir(parents=True, exist_ok=True)
+        workerinput = getattr(session.config, 'workerinput', None)
+        if workerinput is not None:
+            part = self.index.with_name(f'{self.index.stem}.{workerinput["workerid"]}.json')
+            part.write_text(json.dumps(self.recorded))
+            return
+
+        tests = dict(self.recorded)
+        for part in self.index.parent.glob(f'{self.index.stem}.*.json'):
+            tests.update(json.loads(part.read_text()))
+            part.unlink()
+        self.index.write_text(
+            json.dumps({'commit': _git(self.root, 'rev-parse', 'HEAD').strip(), 'tests': tests}, indent=1)
+        )
+
+    # --- select ---
+
+    def pytest_collection_modifyitems(self, config, items):
+        if self.mode != 'select':
+            return
+        if not self.index.exists():
+            self._report.append(f'impact: no index at {self.index}, running all tests')
+            return
+        index = json.loads(self.index.read_text())
+        changes = changes_since(index['commit'], self.root)
+        to_run = affected(index['tests'], changes)
+        if to_run is None:
+            self._report.append(f'impact: changes unknown to index since {index["commit"][:7]}, running all tests')
+            return
+
+        selected, deselected = [], []
+        for item in items:
+            is_selected = (
+                item.nodeid in to_run
+                or item.nodeid not in index['tests']
+                or item.get_closest_marker('smoke') is not None
+            )
+            (selected if is_selected else deselected).append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        self._report.append(
+            f'impact: {len(selected)} of {len(selected) + len(deselected)} tests selected '
+            f'by changes since {index["commit"][:7]} in: {", ".join(sorted(changes)) or "nothing"}'
+        )
+
+    def pytest_report_collectionfinish(self, config, start_path, items) -> Iterable[str]:
+        return self._report
@@ -0,0 +1,249 @@
+"""
+Memory aware parallelization: xdist workers and their browsers are limited by free RAM, not only by CPUs.
+
+With `-n auto`, xdist starts a worker per CPU, but each worker drives a browser that takes hundreds of MB,
+so on a machine with many CPUs and not so much RAM, the whole run slows down because of swapping.
+The autoscaler:
+- sizes `-n auto` workers by available memory minus headroom divided by RSS of one browser
+  (as measured by previous runs, or estimated), but not more than the number of CPUs;
+- measures RSS of the browser process tree after the first tests of each worker,
+  and stores the median per browser name between runs;
+- throttles starting a new browser while there is not enough available memory for it,
+  starting browsers one by one between workers, so they do not see the same free memory at once;
+- recycles the browser that outgrew the threshold instead of reusing it (see reruns.park),
+  that catches memory leaks of long-living browsers;
+- logs all its decisions in the terminal summary of the session.
+
+Memory is measured via /proc, so only local browsers on Linux are measured,
+elsewhere everything works as usual.
+
+Usually the autoscaler is registered in conftest.py with values from config.settings.memory_*
+"""
+import contextlib
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import pytest
+
+from web_test.assist.selenium.typing import WebDriver
+
+_PROC = Path('/proc')
+
+
+def available_mb() -> Optional[float]:
+    """
+    memory available for new processes without swapping, or None if unknown
+    """
+    try:
+        for line in (_PROC / 'meminfo').read_text().splitlines():
+            if line.startswith('MemAvailable:'):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _children_by_parent() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    for stat in _PROC.glob('[0-9]*/stat'):
+        try:
+            # the process name in parentheses may contain spaces, so the fields are counted after it
+            fields = stat.read_text().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+    return children
+
+
+def _rss_mb_of(pid: int) -> float:
+    try:
+        for line in (_PROC / str(pid) / 'status').read_text().splitlines():
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """
+    resident memory of the process with all its descendants, or None if unknown
+    """
+    if not (_PROC / str(pid)).exists():
+        return None
+    children = _children_by_parent()
+    total, pending = 0.0, [pid]
+    while pending:
+        current = pending.pop()
+        total += _rss_mb_of(current)
+        pending.extend(children.get(current, []))
+    return total
+
+
+def browser_rss_mb(driver: WebDriver) -> Optional[float]:
+    """
+    resident memory of the local browser with its driver, or None for remote ones
+    """
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    return rss_mb(process.pid) if process is not None else None
+
+
+@contextlib.contextmanager
+def _exclusively(lock_file: Path) -> Iterator[None]:
+    """
+    between processes, if file locks are supported
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    with lock_file.open('w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class Autoscaler:
+    def __init__(
+        self,
+        *,
+        browser_name: str,
+        browser_rss_mb: float,
+        headroom_mb: float,
+        recycle_rss_mb: float,
+        stats: str | Path,
+        samples: int = 3,
+        start_timeout: float = 60,
+    ):
+        self.browser_name = browser_name
+        self.headroom_mb = headroom_mb
+        self.recycle_rss_mb = recycle_rss_mb
+        self.stats_file = Path(stats)
+        self.samples_limit = samples
+        self.start_timeout = start_timeout
+        self.stats: Dict[str, dict] = (
+            json.loads(self.stats_file.read_text()) if self.stats_file.exists() else {}
+        )
+        self.estimated_rss_mb = self.stats.get(browser_name, {}).get('rss_mb', browser_rss_mb)
+        self.samples: List[float] = []
+        self._worker = ''
+        self._report: List[str] = []
+
+    def _log(self, decision: str) -> None:
+        self._report.append(f'memory: {self._worker}{decision}')
+
+    @property
+    def expected_rss_mb(self) -> float:
+        return statistics.median(self.samples) if self.samples else self.estimated_rss_mb
+
+    # --- decisions ---
+
+    def workers(self, cpus: int) -> int:
+        """
+        the number of workers to fit available memory, but not more than cpus
+        """
+        available = available_mb()
+        if available is None:
+            self._log(f'{cpus} workers by cpus, available memory is unknown')
+            return cpus
+        fitting = int((available - self.headroom_mb) // self.expected_rss_mb)
+        workers = max(1, min(cpus, fitting))
+        self._log(
+            f'{workers} workers of {cpus} cpus, '
+            f'by ({available:.0f} MB available - {self.headroom_mb:.0f} MB headroom) '
+            f'/ {self.expected_rss_mb:.0f} MB per {self.browser_name}'
+        )
+        return workers
+
+    def starting(self, build: Callable[[], WebDriver]) -> WebDriver:
+        """
+        builds the driver as soon as there is enough memory for one more browser
+        """
+        with _exclusively(self.stats_file.with_name('browser-start.lock')):
+            started = time.monotonic()
+            available = available_mb()
+            while (
+                available is not None
+                and available - self.headroom_mb < self.expected_rss_mb
+                and time.monotonic() - started < self.start_timeout
+            ):
+                time.sleep(1)
+                available = available_mb()
+            waited = time.monotonic() - started
+            if waited >= 1:
+                self._log(
+                    f'waited {waited:.0f}s to start a browser, '
+                    f'{available:.0f} MB available for {self.expected_rss_mb:.0f} MB expected'
+                )
+            return build()
+
+    def outgrown(self, driver: WebDriver, test: str) -> bool:
+        """
+        measures the browser after the test, returns True if it should not be reused by other tests
+        """
+        rss = browser_rss_mb(driver)
+        if rss is None:
+            return False
+        if len(self.samples) < self.samples_limit:
+            self.samples.append(rss)
+        if rss <= self.recycle_rss_mb:
+            return False
+        self._log(f'recycled the browser of {test} at {rss:.0f} MB > {self.recycle_rss_mb:.0f} MB')
+        return True
+
+    # --- session ---
+
+    def pytest_sessionstart(self, session):
+        workerinput = getattr(session.config, 'workerinput', None)
+        if workerinput is not None:
+            self._worker = f'{workerinput["workerid"]}: '
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        output = getattr(node, 'workeroutput', {}).get('memory')
+        if output is not None:
+            self.samples.extend(output['samples'])
+            self._report.extend(output['report'])
+
+    def pytest_sessionfinish(self, session):
+        workeroutput = getattr(session.config, 'workeroutput', None)
+        if workeroutput is not None:
+            workeroutput['memory'] = {'samples': self.samples, 'report': self._report}
+            return
+        if not self.samples:
+            return
+        measured = statistics.median(self.samples)
+        self.stats[self.browser_name] = {'rss_mb': round(measured), 'samples': len(self.samples)}
+        self._log(f'measured {measured:.0f} MB per {self.browser_name} by {len(self.samples)} samples')
+        self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+        self.stats_file.write_text(json.dumps(self.stats, indent=2, sort_keys=True))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self._report:
+            return
+        terminalreporter.write_sep('-', 'memory autoscaling')
+        for line in self._report:
+            terminalreporter.write_line(line)
+
+
+_active: Optional[Autoscaler] = None
+
+
+def activate(autoscaler: Optional[Autoscaler]) -> None:
+    global _active
+    _active = autoscaler
+
+
+def starting(build: Callable[[], WebDriver]) -> WebDriver:
+    return _active.starting(build) if _active is not None else build()
+
+
+def outgrown(driver: WebDriver, test: str) -> bool:
+    return _active is not None and _active.outgrown(driver, test)
@@ -0,0 +1,191 @@
+"""
+A local offline mirror of the web pages used in tests.
+
+The mirror is a threaded local http server,
+that serves snapshots of original pages by urls like:
+
+    http://127.0.0.1:<port>/<original host>/<original path>?<original query>
+
+In 'record' mode, the pages that were not recorded yet
+are fetched from original hosts and saved as snapshots.
+In 'replay' mode, only recorded snapshots are served,
+so tests do not need network at all and always see the same pages.
+
+Usually it is started by the session fixture in conftest.py
+according to config.settings.mirror, and then browser.open
+rewrites all absolute urls to the mirrored ones via mirror.url(...)
+"""
+import contextlib
+import hashlib
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, Literal, Optional, Tuple
+from urllib.parse import urlsplit
+
+Mode = Literal['off', 'record', 'replay']
+
+Snapshot = Tuple[int, str, bytes]
+"""
+status, content type and body of a recorded response
+"""
+
+_REWRITABLE_CONTENT_TYPES = ('text/html', 'text/css', 'javascript', 'json')
+
+
+class Snapshots:
+    """
+    Recorded responses stored in a directory as files,
+    indexed by `<host>/<path>?<query>` keys in the index.json file
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._index_file = self.directory / 'index.json'
+        self._lock = threading.Lock()
+        self._index: Dict[str, dict] = (
+            json.loads(self._index_file.read_text()) if self._index_file.exists() else {}
+        )
+
+    @property
+    def hosts(self) -> set:
+        return {key.split('/', 1)[0] for key in self._index}
+
+    def keys(self, content_type: str = '') -> list:
+        """
+        keys of recorded responses, only of the given content type if specified
+        """
+        return sorted(key for key, entry in self._index.items() if content_type in entry['content_type'])
+
+    def get(self, key: str) -> Optional[Snapshot]:
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        return entry['status'], entry['content_type'], (self.directory / entry['file']).read_bytes()
+
+    def put(self, key: str, snapshot: Snapshot) -> None:
+        status, content_type, body = snapshot
+        file = hashlib.sha1(key.encode()).hexdigest()
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / file).write_bytes(body)
+            self._index[key] = {'status': status, 'content_type': content_type, 'file': file}
+            self._index_file.write_text(json.dumps(self._index, indent=2, sort_keys=True))
+
+
+def _fetched(key: str, timeout: float = 30) -> Optional[Snapshot]:
+    request = urllib.request.Request(f'https://{key}', headers={'User-Agent': 'Mozilla/5.0'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.headers.get('Content-Type', ''), response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.headers.get('Content-Type', ''), error.read()
+    except (urllib.error.URLError, TimeoutError):
+        return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: 'MirrorServer'
+
+    def do_GET(self):
+        key = self._key()
+        snapshot = self.server.snapshots.get(key)
+        if snapshot is None and self.server.mode == 'record':
+            snapshot = _fetched(key)
+            if snapshot is not None:
+                self.server.snapshots.put(key, snapshot)
+        if snapshot is None:
+            self.send_error(404, f'No snapshot for {key}')
+            return
+
+        status, content_type, body = snapshot
+        if any(rewritable in content_type for rewritable in _REWRITABLE_CONTENT_TYPES):
+            body = self.server.with_mirrored_links(body)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _key(self) -> str:
+        path = self.path.lstrip('/')
+        first_segment = path.split('/', 1)[0].split('?', 1)[0]
+        referer_host = self._referer_host()
+        if referer_host and first_segment not in self.server.snapshots.hosts:
+            # a root-relative link from a mirrored page,
+            # like /tables or /favicon.ico from /the-internet.herokuapp.com/
+            path = referer_host + '/' + path
+        path, question, query = path.partition('?')
+        return (path if '/' in path else path + '/') + question + query
+
+    def _referer_host(self) -> Optional[str]:
+        """
+        the original host of the mirrored page that referred to the requested url, if any
+        """
+        referer = self.headers.get('Referer')
+        if not referer or not referer.startswith(self.server.origin + '/'):
+            return None
+        return urlsplit(referer).path.lstrip('/').split('/', 1)[0] or None
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MirrorServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, snapshots: Snapshots, mode: Mode, address: Tuple[str, int] = ('127.0.0.1', 0)):
+        super().__init__(address, _Handler)
+        self.snapshots = snapshots
+        self.mode = mode
+
+    @property
+    def origin(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def url(self, original: str) -> str:
+        parts = urlsplit(original)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            return original
+        # an empty path is kept as is, so e.g. a mirrored base_url can be joined with '/path' as the original one
+        return f'{self.origin}/{parts.netloc}{parts.path}' + (f'?{parts.query}' if parts.query else '')
+
+    def with_mirrored_links(self, body: bytes) -> bytes:
+        for host in self.snapshots.hosts:
+            mirrored = f'{self.origin}/{host}'.encode()
+            for original in (f'https://{host}', f'http://{host}', f'//{host}'):
+                body = body.replace(original.encode(), mirrored)
+        return body
+
+
+_running: Optional[MirrorServer] = None
+
+
+def url(original: str) -> str:
+    """
+    returns the mirrored url if the mirror is running, otherwise the original one
+    """
+    return _running.url(original) if _running else original
+
+
+@contextlib.contextmanager
+def serving(directory: str, mode: Mode) -> Iterator[Optional[MirrorServer]]:
+    global _running
+    if mode == 'off':
+        yield None
+        return
+
+    server = MirrorServer(Snapshots(directory), mode)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _running = server
+    try:
+        yield server
+    finally:
+        _running = None
+        server.shutdown()
+        server.server_close()
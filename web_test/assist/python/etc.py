@@ -1,2 +1,24 @@
 def list_intersection(one: list, another: list, /):
     return list(set(one) & set(another))
+
+
+def has_empty_body(fn, /) -> bool:
+    """
+    checks if the function body consists only of docstrings, `pass` or `...`
+    """
+    import ast
+    import inspect
+    import textwrap
+
+    try:
+        definition = ast.parse(textwrap.dedent(inspect.getsource(fn))).body[0]
+    except (OSError, TypeError, SyntaxError):
+        return False
+    if not isinstance(definition, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        # e.g. a lambda assigned to a name, that has no body of statements
+        return False
+    return all(
+        isinstance(statement, ast.Pass)
+        or (isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant))
+        for statement in definition.body
+    )
@@ -0,0 +1,283 @@
+"""
+Rerun controller for tests marked by mark.flaky
+
+Compared to immediate reruns of pytest-rerunfailures, it:
+- defers reruns to the end of the session (of the xdist worker if run in parallel),
+  so the rest of tests are not blocked by them;
+- limits all reruns in the session by a budget
+  (split between xdist workers), so a broken environment
+  does not multiply the suite time by the number of reruns;
+- stops rerunning (opens the circuit breaker) while the failure rate
+  among recent test attempts is not lower than the threshold;
+- optionally reuses a browser of a passed test for a rerun,
+  instead of starting a new one (see park and take below);
+- persists per-test flakiness statistics between runs.
+
+Usually the controller is registered in conftest.py with values from config.settings.reruns_*
+"""
+import collections
+import json
+import math
+import time
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+import pytest
+from _pytest.runner import call_and_report, runtestprotocol
+
+from web_test.assist.selenium.typing import WebDriver
+
+MARKER = 'rerun'
+
+Stats = Dict[str, Dict[str, int]]
+"""
+per test id counters of:
+- runs (test was run at all in a session),
+- failures (its first attempt failed),
+- reruns (how many times it was rerun),
+- recoveries (it passed on rerun)
+"""
+
+
+def _empty_stats() -> Dict[str, int]:
+    return {'runs': 0, 'failures': 0, 'reruns': 0, 'recoveries': 0}
+
+
+class Controller:
+    def __init__(
+        self,
+        *,
+        budget: int,
+        breaker_window: int,
+        breaker_failure_rate: float,
+        reuse_session: bool,
+        stats: str | Path,
+    ):
+        self.budget = budget
+        self.reruns_left = budget
+        self.breaker_failure_rate = breaker_failure_rate
+        self.reuse_session = reuse_session
+        self.stats_file = Path(stats)
+        self.stats: Stats = {}
+        self.deferred: Deque[pytest.Item] = collections.deque()
+        self._recent: Deque[bool] = collections.deque(maxlen=breaker_window)
+        self._breaker_was_open = False
+        self._failed: Dict[str, bool] = {}
+        self._parked: Optional[WebDriver] = None
+        self._report: List[str] = []
+
+    # --- decisions ---
+
+    def check_breaker(self) -> bool:
+        """
+        opens or closes the circuit breaker by the failure rate of recent attempts (logging the change),
+        returns whether it is open
+        """
+        is_open = (
+            len(self._recent) == self._recent.maxlen
+            and sum(self._recent) / len(self._recent) >= self.breaker_failure_rate
+        )
+        if is_open != self._breaker_was_open:
+            self._breaker_was_open = is_open
+            self._report.append(
+                f'reruns: circuit breaker {"opened" if is_open else "closed"} '
+                f'at failure rate {sum(self._recent)}/{len(self._recent)}'
+            )
+        return is_open
+
+    @staticmethod
+    def _max_reruns(item: pytest.Item) -> int:
+        marker = item.get_closest_marker(MARKER)
+        if marker is None or not marker.kwargs.get('condition', True):
+            return 0
+        return marker.kwargs.get('reruns', 0)
+
+    def _may_rerun(self, item: pytest.Item) -> bool:
+        """
+        whether the item can be rerun if its current attempt fails
+        """
+        return (
+            item.execution_count <= self._max_reruns(item)
+            and self.reruns_left > 0
+            and not self.check_breaker()
+        )
+
+    # --- running ---
+
+    def _run(self, item: pytest.Item, nextitem: Optional[pytest.Item]) -> bool:
+        """
+        runs one attempt of the item, returns whether it was deferred to be rerun
+        """
+        item.execution_count = getattr(item, 'execution_count', 0) + 1
+        may_rerun = self._may_rerun(item)
+        keeping_session = may_rerun and nextitem is None
+        stats = self.stats.setdefault(item.nodeid, _empty_stats())
+        if item.execution_count == 1:
+            stats['runs'] += 1
+        else:
+            stats['reruns'] += 1
+            time.sleep(item.get_closest_marker(MARKER).kwargs.get('reruns_delay', 0))
+
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        # while the item might be rerun, the session fixtures should stay alive
+        reports = runtestprotocol(item, nextitem=item.session if keeping_session else nextitem, log=False)
+        failed = any(report.failed for report in reports)
+        deferred = failed and may_rerun
+        for report in reports:
+            report.rerun = item.execution_count - 1
+            if deferred and report.failed:
+                report.outcome = 'rerun'
+                item.ihook.pytest_runtest_logreport(report=report)
+                break
+            if report.when == 'teardown' and keeping_session and not deferred:
+                # the session is torn down below, and both teardowns are logged as one report
+                report = self._torn_down_with_session(item, report)
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+
+        if deferred:
+            self.reruns_left -= 1
+            self.deferred.append(item)
+        if failed and item.execution_count == 1:
+            stats['failures'] += 1
+        if not failed and item.execution_count > 1:
+            stats['recoveries'] += 1
+        return deferred
+
+    @staticmethod
+    def _torn_down_with_session(item: pytest.Item, teardown: pytest.TestReport) -> pytest.TestReport:
+        """
+        tears down the session kept alive for possible reruns of the last item,
+        returns the report of the item teardown, or of the session one if only the latter failed
+        """
+        session_teardown = call_and_report(item, 'teardown', log=False, nextitem=None)
+        session_teardown.rerun = teardown.rerun
+        return teardown if teardown.failed or not session_teardown.failed else session_teardown
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item: pytest.Item, nextitem: Optional[pytest.Item]):
+        is_last_with_deferred = nextitem is None and self.deferred
+        if item.get_closest_marker(MARKER) is None and not is_last_with_deferred:
+            return None
+
+        if item.get_closest_marker(MARKER) is None:
+            # the last item of the session, run it keeping the session for deferred reruns
+            item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+            runtestprotocol(item, nextitem=self.deferred[0], log=True)
+            item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        else:
+            self._run(item, nextitem if nextitem is not None or not self.deferred else self.deferred[0])
+
+        if nextitem is None:
+            while self.deferred:
+                deferred = self.deferred.popleft()
+                self._run(deferred, self.deferred[0] if self.deferred else None)
+        return True
+
+    # --- tracking ---
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when == 'call' or report.failed:
+            self._failed[item.nodeid] = report.failed
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == 'call' or report.failed:
+            self._recent.append(report.failed or report.outcome == 'rerun')
+
+    def pytest_report_teststatus(self, report):
+        if report.outcome == 'rerun':
+            return 'rerun', 'R', ('RERUN', {'yellow': True})
+
+    # --- session reuse ---
+
+    def park(self, item: pytest.Item, driver: WebDriver) -> bool:
+        """
+        keeps the driver of the passed test to be reused by a rerun,
+        returns False if there is no need in it, so the driver should be quit
+        """
+        if (
+            not self.reuse_session
+            or self._parked is not None
+            or self._failed.get(item.nodeid, True)
+            or not self.deferred
+        ):
+            return False
+        self._parked = driver
+        return True
+
+    def take(self, item: pytest.Item) -> Optional[WebDriver]:
+        """
+        returns the parked driver for a rerun of the item if the driver is still alive
+        """
+        if getattr(item, 'execution_count', 1) < 2 or self._parked is None:
+            return None
+        driver, self._parked = self._parked, None
+        try:
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+        except Exception:
+            return None
+        return driver
+
+    # --- session ---
+
+    def pytest_sessionstart(self, session):
+        workerinput = getattr(session.config, 'workerinput', None)
+        if workerinput is not None:
+            self.reruns_left = math.ceil(self.budget / workerinput['workercount'])
+
+    def pytest_sessionfinish(self, session):
+        if self._parked is not None:
+            self._parked.quit()
+            self._parked = None
+
+        workerinput = getattr(session.config, 'workerinput', None)
+        if workerinput is not None:
+            self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+            self.stats_file.with_name(
+                f'{self.stats_file.stem}.{workerinput["workerid"]}.json'
+            ).write_text(json.dumps(self.stats))
+            return
+
+        stats: Stats = json.loads(self.stats_file.read_text()) if self.stats_file.exists() else {}
+        parts = [self.stats] + [
+            json.loads(part.read_text()) for part in self.stats_file.parent.glob(f'{self.stats_file.stem}.*.json')
+        ]
+        for part in parts:
+            for test, counters in part.items():
+                total = stats.setdefault(test, _empty_stats())
+                for name, value in counters.items():
+                    total[name] = total.get(name, 0) + value
+        for part in self.stats_file.parent.glob(f'{self.stats_file.stem}.*.json'):
+            part.unlink()
+        if stats:
+            self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+            self.stats_file.write_text(json.dumps(stats, indent=2, sort_keys=True))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        used = self.budget - self.reruns_left
+        if not used and not self._report:
+            return
+        terminalreporter.write_sep('-', 'flaky reruns')
+        terminalreporter.write_line(f'reruns: {used} of budget {self.budget} used')
+        for line in self._report:
+            terminalreporter.write_line(line)
+
+
+_active: Optional[Controller] = None
+
+
+def activate(controller: Optional[Controller]) -> None:
+    global _active
+    _active = controller
+
+
+def park(item: pytest.Item, driver: WebDriver) -> bool:
+    return _active is not None and _active.park(item, driver)
+
+
+def take(item: pytest.Item) -> Optional[WebDriver]:
+    return _active.take(item) if _active is not None else None
@@ -1 +1 @@
-from . import report, shared
+from . import report, shared, context, observer, fusion, handles, locator_cost, state
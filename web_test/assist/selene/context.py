@@ -0,0 +1,68 @@
+"""
+Context-local browser, so one process can drive many browsers, e.g. from a thread pool.
+
+The ``browser`` below and all elements built from it resolve their config
+(and hence the driver, timeout, wait decorator, last snapshots, etc.)
+from the current context at the moment of each call, not at the moment they were built.
+So even elements defined on module level of page modules are safe to be used from different threads.
+
+By default, the current context config is the config of selene's shared browser,
+so if nothing is set explicitly, everything works as with ``selene.browser``.
+
+To drive another browser in the current thread::
+
+    from selene import Config
+    from web_test.assist.selene import context
+
+    with context.using(Config(driver=driver, timeout=config.settings.timeout)):
+        web.ecosia.open()
+        # ...
+
+Remember that the ``selene.browser`` itself is not context-local,
+so tests and page objects that should be run in parallel from one process
+have to use the ``browser`` from this module.
+"""
+import contextlib
+import contextvars
+from typing import Any, Iterator
+
+from selene import Browser, Config
+from selene.support.shared import browser as _shared_browser
+
+_current_config: contextvars.ContextVar[Config] = contextvars.ContextVar(
+    'current_config', default=_shared_browser.config
+)
+
+
+class _ContextConfig:
+    """
+    Proxies all attributes access to the config of the current context
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_current_config.get(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(_current_config.get(), name, value)
+
+    def __repr__(self):
+        return f'context config: {_current_config.get()!r}'
+
+
+browser = Browser(_ContextConfig())  # type: ignore
+
+
+def config() -> Config:
+    return _current_config.get()
+
+
+@contextlib.contextmanager
+def using(config_: Config) -> Iterator[Browser]:
+    """
+    makes the ``browser`` and all its elements to use the config in the current context
+    """
+    token = _current_config.set(config_)
+    try:
+        yield browser
+    finally:
+        _current_config.reset(token)
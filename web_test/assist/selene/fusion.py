@@ -0,0 +1,236 @@
+"""
+Fused commands: a chain of conditions and actions on one element, performed in one wait loop.
+
+Usual chains like
+
+    element.should(be.enabled).click()
+    element.type(text).press_enter()
+
+wait for each command separately, finding the element again each time.
+Being fused, like
+
+    fused(element).should(be.enabled).click()
+    fused(element).type(text).press_enter()
+
+they are performed in one wait loop, where on each poll:
+- the element is found and all leading supported conditions (be.present, be.visible, be.enabled, be.clickable)
+  are checked in one script, if the element can be found by the browser itself
+  (see web_test.assist.selene.observer.path_of),
+  otherwise it is found and checked via Selene's conditions as usual;
+- consecutive type/press commands are sent as one send_keys command;
+- commands done on previous polls are not repeated.
+
+Then each command is still reported as its own step, with the same title as if it was not fused,
+and the failed one (if any) is reported as failed.
+
+A fused chain is performed on its last action (click or press*) or on explicit perform().
+Fusion is opt-in via the `enabled` switch below (see browser_management in conftest.py),
+and if it is off, the chain is performed as usual Selene commands.
+"""
+import warnings
+from typing import Any, List, Optional, Tuple
+
+from selene import Element
+from selene.core import match
+from selene.core.condition import Condition
+from selene.core.wait import Command, Wait
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver import Keys
+
+from web_test.assist import deadlines
+from web_test.assist.selene import observer
+
+enabled = False
+
+_CHECK_SCRIPT = observer.LOCATE_SCRIPT + '''
+const [path, checks] = arguments;
+const element = locate(path)[0];
+if (!element) return [0, null];
+for (let i = 0; i < checks.length; i++) {
+  const check = checks[i];
+  const holds = check === 'present'
+    || (check === 'visible' && visible(element))
+    || (check === 'enabled' && !element.disabled)
+    || (check === 'clickable' && visible(element) && !element.disabled);
+  if (!holds) return [i, null];
+}
+return [checks.length, element];
+'''
+
+_CHECKS = {
+    id(match.element_is_present): 'present',
+    id(match.element_is_visible): 'visible',
+    id(match.element_is_enabled): 'enabled',
+    id(match.element_is_clickable): 'clickable',
+}
+
+Operation = Tuple[str, str, Any]
+"""
+kind ('should', 'type', 'press' or 'click'), description for the step title, and the condition or keys
+"""
+
+
+class _Failed(Exception):
+    def __init__(self, index: int, reason: Exception):
+        super().__init__(f'{reason.__class__.__name__}: {reason}')
+        self.index = index
+
+
+class Fused:
+    def __init__(self, element: Element):
+        self._element = element
+        self._operations: List[Operation] = []
+        self._performed = False
+
+    def __del__(self):
+        if self._operations and not self._performed:
+            warnings.warn(f'fused commands were not performed: {self}', RuntimeWarning)
+
+    def __str__(self):
+        return ', '.join(description for _, description, _ in self._operations)
+
+    # --- chain ---
+
+    def should(self, condition: Condition[Element]) -> 'Fused':
+        self._operations.append(('should', str(condition), condition))
+        return self
+
+    def type(self, text: str | int) -> 'Fused':
+        self._operations.append(('type', f'type: {text}', (str(text),)))
+        return self
+
+    def press(self, *keys: str) -> Element:
+        self._operations.append(('press', f'press keys: {keys}', keys))
+        return self.perform()
+
+    def press_enter(self) -> Element:
+        return self.press(Keys.ENTER)
+
+    def press_escape(self) -> Element:
+        return self.press(Keys.ESCAPE)
+
+    def press_tab(self) -> Element:
+        return self.press(Keys.TAB)
+
+    def click(self) -> Element:
+        self._operations.append(('click', 'click', None))
+        return self.perform()
+
+    # --- performing ---
+
+    def perform(self) -> Element:
+        self._performed = True
+        if not enabled:
+            return self._performed_one_by_one()
+
+        done = 0
+        webelement = None
+        failure: Optional[_Failed] = None
+
+        def poll(element: Element):
+            nonlocal done, webelement, failure
+            try:
+                if webelement is None:
+                    webelement, done = self._located_and_checked(element, done)
+                while done < len(self._operations):
+                    kind, _, argument = self._operations[done]
+                    if kind == 'should':
+                        argument(element)
+                        done += 1
+                    elif kind == 'click':
+                        webelement.click()
+                        done += 1
+                    else:
+                        keys, merged = self._keys_from(done)
+                        webelement.send_keys(*keys)
+                        done += merged
+            except Exception as reason:
+                if isinstance(reason, StaleElementReferenceException):
+                    webelement = None
+                failure = reason if isinstance(reason, _Failed) else _Failed(done, reason)
+                raise failure
+
+        wait = Wait(self._element, self._element.config.timeout, self._element.wait.hook_failure)
+        try:
+            with deadlines.waiting(wait, f'{self._element}: {self}') as left:
+                (wait.at_most(left) if left is not None and left < wait._timeout else wait).for_(
+                    Command(str(self), poll)
+                )
+        except BaseException as error:
+            # including the failure of an exhausted deadline, that is not an Exception
+            self._report(until=failure.index if failure else 0, error=error)
+            raise
+        self._report(until=len(self._operations))
+        return self._element
+
+    def _performed_one_by_one(self) -> Element:
+        for kind, _, argument in self._operations:
+            if kind == 'should':
+                self._element.should(argument)
+            elif kind == 'click':
+                self._element.click()
+            elif kind == 'type':
+                self._element.type(*argument)
+            else:
+                self._element.press(*argument)
+        return self._element
+
+    def _located_and_checked(self, element: Element, done: int):
+        """
+        finds the element and checks the leading supported conditions starting from done,
+        in one script if possible, returns the web element and the number of done operations
+        """
+        checks = []
+        for kind, _, argument in self._operations[done:]:
+            if kind != 'should' or id(argument) not in _CHECKS:
+                break
+            checks.append(_CHECKS[id(argument)])
+        path = observer.path_of(element) if checks else None
+        if path is None:
+            return element.locate(), done
+
+        checked, webelement = element.config.driver.execute_script(_CHECK_SCRIPT, path, checks)
+        if webelement is None:
+            # let the failed condition explain the reason,
+            # or, if it passes in Selene's opinion, check it again as usual
+            try:
+                self._operations[done + checked][2](element)
+            except Exception as reason:
+                raise _Failed(done + checked, reason) from reason
+            return element.locate(), done + checked
+        return webelement, done + checked
+
+    def _keys_from(self, index: int) -> Tuple[List[str], int]:
+        keys = []
+        merged = 0
+        for kind, _, argument in self._operations[index:]:
+            if kind not in ('type', 'press'):
+                break
+            keys.extend(argument)
+            merged += 1
+        return keys, merged
+
+    def _report(self, until: int, error: Optional[Exception] = None) -> None:
+        """
+        reports done operations as steps via the configured wait decorator, and the failed one if any
+        """
+        wait = self._element.wait
+
+        for index, (_, description, _) in enumerate(self._operations[: until + (error is not None)]):
+            failed = error is not None and index == until
+
+            def replay(_, failed=failed):
+                if failed:
+                    raise error
+
+            try:
+                # the steps are replayed after the real wait, so they are not limited by deadlines again
+                with deadlines.suspended():
+                    wait._decorator(wait)(lambda fn: fn(wait.entity))(Command(description, replay))
+            except BaseException:
+                if not failed:
+                    raise
+
+
+def fused(element: Element) -> Fused:
+    return Fused(element)
@@ -0,0 +1,114 @@
+"""
+Cache of found web elements for named elements of described page models, i.e. elements with descriptions,
+like `page.modal.section` or `table.header` (see web_test.assist.allure.chainable_naming).
+
+Selene finds elements lazily, so each command on `page.modal.section` finds again
+all elements of the chain from the root, one find_element command per each level of the chain.
+Being cached by full path of the element, like 'PageWithModal.modal.section',
+together with its locator (so differently located elements of the same name are not mixed up),
+the found web element is reused by further commands:
+- the cached element asked as the one to act on is validated by one cheap command,
+  so a deep element is checked by one command instead of being found again by a command per each level;
+- the cached elements of parents, asked by their children being found, are not validated at all,
+  because children are found in them by the browser that tells itself if they are stale.
+
+The cached element is found again on StaleElementReferenceException,
+and all cached elements are forgotten on navigation by browser.open, or on another driver.
+
+Hits and misses of the cache are counted per test.
+
+Usage (see browser_management and the Element.locate patch in conftest.py):
+
+    with handles.caching() as cache:
+        ...  # test body
+    cache.counters  # {'hits': ..., 'misses': ..., 'stale': ...}
+"""
+import contextlib
+import contextvars
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from selene import Element
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+
+
+def _empty_counters() -> Dict[str, int]:
+    return {'hits': 0, 'misses': 0, 'stale': 0}
+
+
+class Cache:
+    def __init__(self):
+        self.counters = _empty_counters()
+        self._handles: Dict[Tuple[str, str], WebElement] = {}
+        self._depth = 0
+
+    def navigated(self) -> None:
+        self._handles.clear()
+
+    def located(self, element: Element, locate: Callable[[Element], WebElement]) -> WebElement:
+        key = (element.get_full_path(), str(element))
+        driver = element.config.driver
+        handle = self._handles.get(key)
+        is_asked_to_act_on = self._depth == 0
+
+        if handle is not None and handle.parent is driver:
+            try:
+                if is_asked_to_act_on:
+                    handle.tag_name  # the cheapest command to check that it is not stale
+                self.counters['hits'] += 1
+                return handle
+            except StaleElementReferenceException:
+                self.counters['stale'] += 1
+
+        self.counters['misses'] += 1
+        handle = self.found_in_cached_parents(element, locate)
+        self._handles[key] = handle
+        return handle
+
+    def found_in_cached_parents(self, element: Element, locate: Callable[[Element], WebElement]) -> WebElement:
+        self._depth += 1
+        try:
+            try:
+                return locate(element)
+            except StaleElementReferenceException:
+                # one of cached parents is stale, that usually means the whole page part was rendered again,
+                # and the full path is a path of names, not of search contexts, so all are forgotten
+                self.counters['stale'] += 1
+                self.navigated()
+                return locate(element)
+        finally:
+            self._depth -= 1
+
+
+_current: contextvars.ContextVar[Optional[Cache]] = contextvars.ContextVar('handles_cache', default=None)
+
+
+@contextlib.contextmanager
+def caching(enabled: bool = True) -> Iterator[Optional[Cache]]:
+    """
+    caches found elements within the block if enabled, yields the cache to read its counters
+    """
+    cache = Cache() if enabled else None
+    token = _current.set(cache)
+    try:
+        yield cache
+    finally:
+        _current.reset(token)
+
+
+def located(element: Element, locate: Callable[[Element], WebElement]) -> WebElement:
+    """
+    finds the element via locate, or takes it from the current cache if the element is named
+    """
+    cache = _current.get()
+    if cache is None:
+        return locate(element)
+    if not getattr(element, 'description', ''):
+        return cache.found_in_cached_parents(element, locate)
+    return cache.located(element, locate)
+
+
+def navigated() -> None:
+    cache = _current.get()
+    if cache is not None:
+        cache.navigated()
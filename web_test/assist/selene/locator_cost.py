@@ -0,0 +1,364 @@
+"""
+Locator cost profiler for locators of page objects.
+
+Locators like `.//*[contains(@class,"a") or contains(@class,"b")]` (see uglify_class_name in the_internet.py)
+scan all descendants of their search context, and may be much slower than equivalent css selectors on large pages.
+The profiler:
+- collects locators of page objects reachable from given modules (see collected below),
+  i.e. their elements and collections built from the browser, including lazy Component(s) of described elements,
+  and literal locators in calls like `browser.element(by.name('q'))` in their source code;
+- times finding each of them from the root by the browser itself on each page snapshot
+  (see web_test.assist.mirror), as querySelector(All)/XPath evaluation in a loop, like observer does it;
+- times the equivalent css selector (if any) for locators with xpath steps, see css_from below;
+- ranks locators by their worst cost on pages where they find something.
+
+Usually it is run as a benchmark, see tests/test_locator_cost_benchmark.py
+"""
+import ast
+import importlib
+import inspect
+import json
+import pkgutil
+import re
+import textwrap
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+from selene import Collection, Element, by
+from selene.common.helpers import to_by
+
+from web_test.assist.allure.chainable_naming import Child, SlottedChainableNamingElement
+from web_test.assist.selene import observer
+from web_test.assist.selene.observer import Step
+
+_TIMING_SCRIPT = observer.LOCATE_SCRIPT + '''
+const [paths, minMs, minRuns] = arguments;
+return paths.map(path => {
+  let runs = 0, found = 0;
+  const started = performance.now();
+  while (runs < minRuns || performance.now() - started < minMs) {
+    found = locate(path).length;
+    runs++;
+  }
+  return [(performance.now() - started) / runs, found];
+});
+'''
+
+_SIGNIFICANT_SPEEDUP = 0.2
+"""
+the css selector is flagged as faster if it takes less than 80% of the time of the original locator
+"""
+
+
+# --- collecting ---
+
+
+def _modules_from(modules: Iterable[ModuleType]) -> List[ModuleType]:
+    result = []
+    for module in modules:
+        result.append(module)
+        if hasattr(module, '__path__'):
+            result.extend(
+                importlib.import_module(info.name)
+                for info in pkgutil.walk_packages(module.__path__, module.__name__ + '.')
+            )
+    return result
+
+
+def _literal_by(node: ast.expr):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return to_by(node.value)
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == 'by'
+        and len(node.args) == 1
+        and isinstance(node.args[0], ast.Constant)
+        and isinstance(getattr(by, node.func.attr, None), type(by.css))
+    ):
+        return getattr(by, node.func.attr)(node.args[0].value)
+    return None
+
+
+def _from_source(module: ModuleType) -> Dict[str, List[Step]]:
+    """
+    literal locators of elements and collections built right from the browser in the module source
+    """
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(module)))
+    except (OSError, TypeError):
+        return {}
+    found = {}
+    for node in ast.walk(tree):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr in ('element', 'all')
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id == 'browser'
+            and len(node.args) == 1
+        ):
+            continue
+        literal = _literal_by(node.args[0])
+        if literal is None or literal[0] not in observer.SUPPORTED_BY:
+            continue
+        step = 'first' if node.func.attr == 'element' else 'all'
+        found[f'{module.__name__}:{node.lineno}'] = [(step, *literal)]
+    return found
+
+
+def _is_page_object(value: Any) -> bool:
+    return type(value).__module__.startswith('web_test.') and not isinstance(value, (type, ModuleType))
+
+
+def _walk(value: Any, name: str, found: Dict[str, List[Step]], seen: Set[int]) -> None:
+    if id(value) in seen:
+        return
+    seen.add(id(value))
+
+    if isinstance(value, (Element, Collection)):
+        path = observer.path_of(value)
+        if path is not None:
+            found[name] = path
+        return
+    if not _is_page_object(value):
+        return
+
+    attributes = dict(getattr(value, '__dict__', {}))
+    for cls in type(value).__mro__:
+        for attribute, declared in vars(cls).items():
+            if isinstance(declared, Child):
+                attributes[attribute] = getattr(value, attribute)
+        slots = cls.__dict__.get('__slots__', ())
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            if not slot.startswith('__') and hasattr(value, slot):
+                attributes.setdefault(slot, getattr(value, slot))
+    for attribute, child in attributes.items():
+        if attribute != 'previous_name_chain_element':
+            _walk(child, f'{name}.{attribute}', found, seen)
+
+
+def _instantiated(cls: type) -> Optional[Any]:
+    """
+    an instance of the described element class if it can be built without arguments
+    """
+    if not issubclass(cls, SlottedChainableNamingElement) or inspect.isabstract(cls):
+        return None
+    try:
+        return cls()
+    except TypeError:
+        return None
+
+
+def collected(*modules: ModuleType) -> Dict[str, List[Step]]:
+    """
+    returns paths (see observer.path_of) of locators of page objects from the modules and their submodules,
+    by their names like 'web_test.pages.the_internet.PageWithModal.modal.header',
+    each path is returned once, by the name it was found first
+    """
+    found: Dict[str, List[Step]] = {}
+    seen: Set[int] = set()
+    for module in _modules_from(modules):
+        for name, value in vars(module).items():
+            if name.startswith('__'):
+                continue
+            if isinstance(value, type) and value.__module__ == module.__name__:
+                value = _instantiated(value)
+            _walk(value, f'{module.__name__}.{name}', found, seen)
+        found.update(_from_source(module))
+
+    unique: Dict[str, List[Step]] = {}
+    paths: Set[str] = set()
+    for name, path in found.items():
+        key = json.dumps(path)
+        if key not in paths:
+            paths.add(key)
+            unique[name] = path
+    return unique
+
+
+# --- css ---
+
+
+_XPATH_STEP = re.compile(r'(//|/)(\*|[\w-]+)((?:\[[^\[\]]*\])*)')
+_PREDICATE = re.compile(r'\[([^\[\]]*)\]')
+_QUOTED = r'''(?:"([^"]*)"|'([^']*)')'''
+_ATTRIBUTE_EQUALS = re.compile(rf'^@([\w-]+)\s*=\s*{_QUOTED}$')
+_ATTRIBUTE_CONTAINS = re.compile(rf'^contains\(\s*@([\w-]+)\s*,\s*{_QUOTED}\s*\)$')
+_ATTRIBUTE_EXISTS = re.compile(r'^@([\w-]+)$')
+
+
+def _css_string(value: str) -> str:
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _css_condition(condition: str) -> Optional[str]:
+    condition = condition.strip()
+    for pattern, operator in ((_ATTRIBUTE_EQUALS, '='), (_ATTRIBUTE_CONTAINS, '*=')):
+        matched = pattern.match(condition)
+        if matched:
+            name, double_quoted, single_quoted = matched.groups()
+            value = double_quoted if double_quoted is not None else single_quoted
+            return f'[{name}{operator}{_css_string(value)}]'
+    matched = _ATTRIBUTE_EXISTS.match(condition)
+    return f'[{matched.group(1)}]' if matched else None
+
+
+def _css_alternatives(tag: str, predicates: str) -> Optional[List[str]]:
+    """
+    css compounds equivalent to one xpath step, more than one if it has an `or` predicate
+    """
+    alternatives = ['' if tag == '*' else tag]
+    filtered = False
+    for predicate in _PREDICATE.findall(predicates):
+        predicate = predicate.strip()
+        if predicate.isdigit():
+            if filtered:
+                # a position among the filtered ones, like `tr[@class="row"][2]`, is not a position among siblings
+                return None
+            alternatives = [
+                compound + (f':nth-child({predicate})' if tag == '*' else f':nth-of-type({predicate})')
+                for compound in alternatives
+            ]
+            continue
+        options = []
+        for option in re.split(r'\s+or\s+', predicate):
+            conditions = [_css_condition(condition) for condition in re.split(r'\s+and\s+', option)]
+            if None in conditions:
+                return None
+            options.append(''.join(conditions))
+        if len(options) > 1 and len(alternatives) > 1:
+            return None
+        alternatives = [compound + option for compound in alternatives for option in options]
+        filtered = True
+    return [compound or '*' for compound in alternatives]
+
+
+def css_from(xpath: str, from_root: bool = False) -> Optional[str]:
+    """
+    returns the css selector equivalent to the simple xpath of child/descendant steps with tags,
+    attribute and position predicates, like `.//*[contains(@class,"a") or contains(@class,"b")]`,
+    or None if there is no one;
+    absolute xpaths (like `//div`) have equivalents only when searched from the root
+    """
+    xpath = xpath.strip()
+    if xpath.startswith('./'):
+        prefix, rest = ':scope', xpath[1:]
+    elif xpath.startswith('//') and from_root:
+        prefix, rest = '', xpath
+    else:
+        return None
+
+    selectors = [prefix]
+    position = 0
+    for step in _XPATH_STEP.finditer(rest):
+        if step.start() != position:
+            return None
+        position = step.end()
+        axis, tag, predicates = step.groups()
+        alternatives = _css_alternatives(tag, predicates)
+        if alternatives is None or (len(alternatives) > 1 and position != len(rest)):
+            return None
+        combinator = ' > ' if axis == '/' else ' '
+        selectors = [
+            (selector + combinator if selector else '') + compound
+            for selector in selectors
+            for compound in alternatives
+        ]
+    if position != len(rest) or position == 0:
+        return None
+    return ', '.join(selectors)
+
+
+def _with_css(path: List[Step]) -> Optional[List[Step]]:
+    """
+    the same path with xpath steps replaced by equivalent css selectors, or None if any has no equivalent
+    """
+    if not any(using == 'xpath' for step, using, _ in path if step != 'index'):
+        return None
+    result = []
+    for index, (step, using, value) in enumerate(path):
+        if step != 'index' and using == 'xpath':
+            css = css_from(value, from_root=index == 0)
+            if css is None:
+                return None
+            using, value = 'css selector', css
+        result.append((step, using, value))
+    return result
+
+
+# --- profiling ---
+
+
+class Cost(NamedTuple):
+    name: str
+    path: List[Step]
+    page: str
+    ms: float
+    found: int
+    css_path: Optional[List[Step]] = None
+    css_ms: Optional[float] = None
+
+    @property
+    def css_is_faster(self) -> bool:
+        return self.css_ms is not None and self.css_ms < self.ms * (1 - _SIGNIFICANT_SPEEDUP)
+
+    @property
+    def locator(self) -> str:
+        return _described(self.path)
+
+
+def _described(path: List[Step]) -> str:
+    return ' '.join(f'[{using}]' if step == 'index' else f'{using}={value}' for step, using, value in path)
+
+
+def profiled(
+    driver,
+    locators: Dict[str, List[Step]],
+    pages: Iterable[str],
+    min_ms: float = 20,
+    min_runs: int = 5,
+) -> List[Cost]:
+    """
+    times finding each of the locators (and their css equivalents) on each of the pages,
+    returns costs on the worst page for each locator (among pages it finds something on, if any),
+    ranked from the most expensive
+    """
+    names = list(locators)
+    css_paths = {name: _with_css(locators[name]) for name in names}
+    with_css = [name for name in names if css_paths[name] is not None]
+
+    worst: Dict[str, Cost] = {}
+    for page in pages:
+        driver.get(page)
+        timings = driver.execute_script(
+            _TIMING_SCRIPT,
+            [locators[name] for name in names] + [css_paths[name] for name in with_css],
+            min_ms,
+            min_runs,
+        )
+        css_timings = dict(zip(with_css, timings[len(names):]))
+        for name, (ms, found) in zip(names, timings):
+            css_ms = css_timings[name][0] if name in css_timings else None
+            cost = Cost(name, locators[name], page, ms, found, css_paths[name], css_ms)
+            previous = worst.get(name)
+            if previous is None or (cost.found > 0, cost.ms) > (previous.found > 0, previous.ms):
+                worst[name] = cost
+    return sorted(worst.values(), key=lambda cost: cost.ms, reverse=True)
+
+
+def report(costs: List[Cost]) -> str:
+    lines = []
+    for rank, cost in enumerate(costs, start=1):
+        lines.append(
+            f'{rank:>3}. {cost.ms:9.4f} ms  {cost.name}\n'
+            f'     {cost.locator}\n'
+            f'     found {cost.found} on {cost.page}'
+        )
+        if cost.css_ms is not None:
+            flag = 'FASTER ' if cost.css_is_faster else ''
+            lines.append(f'     {flag}css {cost.css_ms:.4f} ms: {_described(cost.css_path)}')
+    flagged = sum(cost.css_is_faster for cost in costs)
+    lines.append(f'{len(costs)} locators profiled, {flagged} of them would be faster as css')
+    return '\n'.join(lines)
@@ -0,0 +1,239 @@
+"""
+A wait engine that waits for common conditions in the browser itself, instead of polling them over WebDriver.
+
+For supported conditions, it installs a MutationObserver (plus a cheap browser-side interval check
+for changes that are not DOM mutations, like css transitions) via one execute_async_script command,
+that resolves as soon as the condition holds or the timeout is over.
+Then the condition is checked once more by Selene itself, so the result and the failure messages
+are exactly the same as when polling.
+
+Supported conditions:
+- for elements: be.visible, be.hidden, be.present, have.text, have.exact_text
+- for collections: have.size, have.size_greater_than_or_equal
+
+The entity should be built by element/all/all_first/[index] from the browser
+with css, xpath, id, name, class name or tag name selectors,
+so the browser can find it again on each mutation
+(see `derived_from` stored by the chaining patch in conftest.py).
+For other conditions and entities, it falls back to usual polling.
+
+Usage (see browser_management in conftest.py):
+
+    browser.config._wait_decorator = wait_with(
+        context=allure_commons._allure.StepContext,
+        engine=observer.engine,
+    )
+"""
+import inspect
+from typing import Any, Callable, List, Optional, Tuple
+
+from selene import Browser, Collection, Element, query
+from selene.common.helpers import to_by
+from selene.core import match
+from selene.core.condition import Condition
+from selene.core.locator import Locator
+from selene.core.wait import Wait
+
+LOCATE_SCRIPT = '''
+const CSS_BY = {
+  'css selector': value => value,
+  'id': value => '#' + CSS.escape(value),
+  'name': value => '[name="' + CSS.escape(value) + '"]',
+  'class name': value => '.' + CSS.escape(value),
+  'tag name': value => value,
+};
+
+function found(context, using, value, first) {
+  if (using in CSS_BY) {
+    const css = CSS_BY[using](value);
+    return first ? [context.querySelector(css)].filter(Boolean) : Array.from(context.querySelectorAll(css));
+  }
+  if (first) {
+    return [document.evaluate(value, context, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue]
+      .filter(Boolean);
+  }
+  const result = document.evaluate(value, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+  const nodes = [];
+  for (let i = 0; i < result.snapshotLength; i++) {
+    nodes.push(result.snapshotItem(i));
+  }
+  return nodes;
+}
+
+function locate(path) {
+  let nodes = [document];
+  for (const [step, using, value] of path) {
+    if (step === 'index') nodes = nodes[using] ? [nodes[using]] : [];
+    else if (step === 'first') nodes = nodes.length ? found(nodes[0], using, value, true) : [];
+    else if (step === 'all') nodes = nodes.length ? found(nodes[0], using, value, false) : [];
+    else if (step === 'each_first') nodes = nodes.flatMap(node => found(node, using, value, true));
+    else if (step === 'each_all') nodes = nodes.flatMap(node => found(node, using, value, false));
+  }
+  return nodes;
+}
+
+function visible(element) {
+  return !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length)
+    && getComputedStyle(element).visibility !== 'hidden';
+}
+'''
+"""
+browser-side functions to find an entity by its path (see path_of below) and check its visibility
+"""
+
+_SCRIPT = LOCATE_SCRIPT + '''
+const [path, condition, expected, timeoutMs, done] = arguments;
+
+function text(element) {
+  return visible(element) ? element.innerText.replace(/\\u00a0/g, ' ').trim() : '';
+}
+
+function holds() {
+  const nodes = locate(path);
+  const element = nodes[0];
+  switch (condition) {
+    case 'present': return nodes.length > 0;
+    case 'visible': return !!element && visible(element);
+    case 'hidden': return !element || !visible(element);
+    case 'text': return !!element && text(element).includes(expected);
+    case 'exact_text': return !!element && text(element) === expected;
+    case 'size': return nodes.length === expected;
+    case 'size_greater_than_or_equal': return nodes.length >= expected;
+  }
+  return false;
+}
+
+let finished = false;
+const observer = new MutationObserver(check);
+const interval = setInterval(check, 250);
+const timer = setTimeout(() => finish(false), timeoutMs);
+
+function finish(result) {
+  if (finished) return;
+  finished = true;
+  observer.disconnect();
+  clearInterval(interval);
+  clearTimeout(timer);
+  done(result);
+}
+
+function check() {
+  try {
+    if (holds()) finish(true);
+  } catch (error) {
+    finish(null);
+  }
+}
+
+observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+check();
+'''
+
+SUPPORTED_BY = ('css selector', 'xpath', 'id', 'name', 'class name', 'tag name')
+"""
+strategies to find elements by in the browser itself via LOCATE_SCRIPT
+"""
+
+Step = Tuple[str, Any, Any]
+
+
+def path_of(entity) -> Optional[List[Step]]:
+    """
+    returns steps to find the entity in the browser, or None if it can't be found there
+    """
+    derived_from = getattr(entity._locator, 'derived_from', None)
+    if derived_from is None:
+        return None
+    parent, method, args = derived_from
+    prefix = [] if isinstance(parent, Browser) else path_of(parent)
+    if prefix is None or len(args) != 1:
+        return None
+    if isinstance(parent, Collection) and method == 'element':
+        return prefix + [('index', args[0], None)] if isinstance(args[0], int) and args[0] >= 0 else None
+    if method not in ('element', 'all', 'all_first') or isinstance(args[0], Locator):
+        return None
+    using, value = to_by(args[0])
+    if using not in SUPPORTED_BY:
+        return None
+    step = {
+        (False, 'element'): 'first',
+        (False, 'all'): 'all',
+        (True, 'all'): 'each_all',
+        (True, 'all_first'): 'each_first',
+    }.get((isinstance(parent, Collection), method))
+    return prefix + [(step, using, value)] if step else None
+
+
+def _query_of(condition: Condition) -> Optional[Callable]:
+    fn = getattr(condition, '_fn', None)
+    if fn is None or fn.__closure__ is None:
+        return None
+    return inspect.getclosurevars(fn).nonlocals.get('query')
+
+
+def _expected_after(prefix: str, condition: Condition) -> Optional[str]:
+    description = str(condition)
+    return description[len(prefix):] if description.startswith(prefix) else None
+
+
+def supported(entity, condition) -> Optional[Tuple[str, Any]]:
+    """
+    returns the browser-side name of the condition and its expected value if supported
+    """
+    if isinstance(entity, Element):
+        if condition is match.element_is_visible:
+            return 'visible', None
+        if condition is match.element_is_hidden:
+            return 'hidden', None
+        if condition is match.element_is_present:
+            return 'present', None
+        if isinstance(condition, Condition) and _query_of(condition) is query.text:
+            for name, prefix in (('exact_text', 'has exact text '), ('text', 'has text ')):
+                expected = _expected_after(prefix, condition)
+                if expected is not None:
+                    return name, expected
+    if isinstance(entity, Collection) and isinstance(condition, Condition):
+        size = _query_of(condition)
+        if getattr(size, '__qualname__', None) == 'collection_has_size.<locals>.size':
+            for name, prefix in (
+                ('size_greater_than_or_equal', 'has size greater than or equal '),
+                ('size', 'has size '),
+            ):
+                expected = _expected_after(prefix, condition)
+                if expected is not None and expected.isdigit():
+                    return name, int(expected)
+    return None
+
+
+def _observed(wait: Wait, path: List[Step], name: str, expected: Any) -> Optional[bool]:
+    """
+    returns whether the condition holds in the browser before the timeout,
+    or None if the browser could not tell it
+    """
+    driver = wait.entity.config.driver
+    timeout = wait._timeout
+    # the script timeout should not interrupt the waiting, but is not asked each time to save a round trip
+    if getattr(driver, '_observer_script_timeout', 0) < timeout + 5:
+        driver.set_script_timeout(timeout + 5)
+        driver._observer_script_timeout = timeout + 5
+    try:
+        return driver.execute_async_script(_SCRIPT, path, name, expected, int(timeout * 1000))
+    except Exception:
+        return None
+
+
+def engine(wait: Wait, for_: Callable[[Callable], Any], fn: Callable) -> Any:
+    """
+    waits for the supported condition in the browser, otherwise falls back to polling via for_
+    """
+    condition = supported(wait.entity, fn)
+    path = path_of(wait.entity) if condition else None
+    if path is None:
+        return for_(fn)
+
+    holds = _observed(wait, path, *condition)
+    if holds is None:
+        return for_(fn)
+    # if the browser says it holds, Selene should confirm it on first try, otherwise it continues polling,
+    # and if it timed out, just fail the Selene's way after one last try
+    return (for_ if holds else Wait(wait.entity, 0, wait.hook_failure).for_)(fn)
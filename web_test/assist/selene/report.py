@@ -3,8 +3,10 @@ The code in this file is basically the code from selene.support, slightly modifi
 their hidden locators.
 """
 
+import contextlib
+import re
 from functools import reduce
-from typing import Any, ContextManager, Dict, Iterable, Protocol, Tuple
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, Optional, Protocol, Tuple
 
 from selene import Collection, Element
 from selenium.webdriver import Keys
@@ -30,9 +32,48 @@ class DefaultTranslations:
         (" and is ", " and be "),
         (" and has ", " and have "),
     )
-    key_codes_to_names = [
-        (f"({repr(value)},)", key) for key, value in Keys.__dict__.items() if not key.startswith("__")
-    ]
+
+
+class KeyCodes:
+    """
+    Humanizes key codes of selenium Keys in step titles, e.g. `press keys: ('\\ue007',)` to `press keys: ENTER`.
+
+    Key codes are private-use unicode characters, so they are found by one scan for such a character
+    (or its escaped repr), and only found ones are looked up by the index of all Keys,
+    while titles without key codes (the majority of them) stay untouched.
+    """
+
+    names: Dict[str, str] = {}
+    """
+    key names by key codes both as characters and as their reprs,
+    the first name wins for aliases like ENTER and RETURN
+    """
+    for _name, _code in Keys.__dict__.items():
+        if not _name.startswith("__"):
+            names.setdefault(_code, _name)
+            names.setdefault(repr(_code)[1:-1], _name)
+    del _name, _code
+
+    _in_tuple = re.compile(r"\('(\\u[ef][0-9a-f]{3}|[\ue000-\uf8ff])',\)")
+
+    @classmethod
+    def humanized(cls, title: str) -> str:
+        return cls._in_tuple.sub(lambda match: cls.names.get(match[1], match[0]), title)
+
+
+def polling(wait, for_: Callable[[Callable], Any], fn: Callable) -> Any:
+    """
+    the default wait engine, that simply polls via Selene's wait logic
+    """
+    return for_(fn)
+
+
+@contextlib.contextmanager
+def unlimited(wait, title: str) -> Iterator[Optional[float]]:
+    """
+    the default deadline, that does not limit waits at all
+    """
+    yield None
 
 
 def wait_with(
@@ -41,8 +82,10 @@ def wait_with(
     translations: Iterable[Tuple[str, str]] = (
         *DefaultTranslations.remove_verbosity,
         *DefaultTranslations.identify_assertions,
-        *DefaultTranslations.key_codes_to_names,
     ),
+    humanize: Callable[[str], str] = KeyCodes.humanized,
+    engine: Callable[[Any, Callable[[Callable], Any], Callable], Any] = polling,
+    deadline: Callable[[Any, str], ContextManager] = unlimited,
 ):
     """
     :return:
@@ -55,6 +98,16 @@ def wait_with(
     :param translations:
         Iterable of translations as (from, to) substitution pairs
         to apply to final title string to log
+    :param humanize:
+        Function to apply to the translated title and locator,
+        by default turns key codes into key names
+    :param engine:
+        Function to actually wait for the fn by the wait with its `for_` logic,
+        polling by default, see also web_test.assist.selene.observer.engine
+    :param deadline:
+        Context manager factory to wrap the wait by, based on the wait and its title,
+        that provides the seconds to shorten the wait to (or None), or fails before it,
+        unlimited by default, see also web_test.assist.deadlines.waiting
     """
 
     def decorator_factory(wait):
@@ -70,21 +123,28 @@ def wait_with(
                     old, new = item
                     return initial.replace(old, new)
 
-                translated_title = reduce(
-                    translate,
-                    translations,
-                    title,
+                translated_title = humanize(
+                    reduce(
+                        translate,
+                        translations,
+                        title,
+                    )
                 )
                 params = {}
                 if isinstance(wait.entity, Element) or isinstance(wait.entity, Collection):
-                    translated_locator = reduce(
-                        translate,
-                        translations,
-                        str(wait.entity),
+                    translated_locator = humanize(
+                        reduce(
+                            translate,
+                            translations,
+                            str(wait.entity),
+                        )
                     )
                     params = {"locator": translated_locator}
-                with context(title=translated_title, params=params):
-                    return for_(fn)
+                with context(title=translated_title, params=params), deadline(wait, translated_title) as left:
+                    if left is not None and left < wait._timeout:
+                        shortened = wait.at_most(left)
+                        return engine(shortened, shortened.for_, fn)
+                    return engine(wait, for_, fn)
 
             return decorated
 
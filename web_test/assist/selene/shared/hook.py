@@ -1,6 +1,6 @@
 import allure
 from selene.core.exceptions import TimeoutException
-from selene.support.shared import browser
+from web_test.assist.selene.context import browser
 
 
 def attach_snapshots_on_failure(error: TimeoutException) -> Exception:
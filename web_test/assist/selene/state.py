@@ -0,0 +1,104 @@
+"""
+Browser state snapshots: the state after a UI setup flow is captured once, and then restored instead of the flow.
+
+Many tests repeat the same preconditions via UI, like opening a page, dismissing its modal, logging in,
+before the actual check. With snapshots, like
+
+    PageWithModal().open_after('modal closed', lambda page: page.modal.close())
+
+the first test in the process (i.e. in the xdist worker) opens the page and performs the flow as usual,
+then the state of the browser (cookies, localStorage, sessionStorage and the url) is captured under the name,
+and next tests restore it in a few commands:
+- open a lightweight page of the same origin (the favicon), so cookies and storages can be set for it;
+- replace all cookies by the captured ones;
+- replace both storages by the captured ones in one script;
+- open the captured url.
+
+State that is not stored in cookies or storages (like one on the server side) is not restored,
+so a snapshot is valid only while the things the flow depends on are the same.
+This is declared by the explicit key, e.g. `key=(user, config.settings.base_url)`,
+snapshots are kept per name and key, so tests alternating keys (like users) restore each one's own,
+and snapshots can be invalidated explicitly via invalidate(), e.g. after a test changes the server side state.
+
+Snapshots are opt-in via the `enabled` switch below (see browser_management in conftest.py),
+and if it is off, the flow is always performed via UI.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Tuple
+from urllib.parse import urljoin
+
+from web_test.assist.selene import handles
+from web_test.assist.selenium.typing import WebDriver
+
+enabled = False
+
+_CAPTURE_SCRIPT = """
+    return [location.href, Object.assign({}, localStorage), Object.assign({}, sessionStorage)]
+"""
+
+_RESTORE_SCRIPT = """
+    const [localItems, sessionItems] = arguments
+    for (const [storage, items] of [[localStorage, localItems], [sessionStorage, sessionItems]]) {
+        storage.clear()
+        for (const [key, value] of Object.entries(items)) {
+            storage.setItem(key, value)
+        }
+    }
+"""
+
+
+class State(NamedTuple):
+    url: str
+    cookies: List[dict]
+    local_storage: Dict[str, str]
+    session_storage: Dict[str, str]
+
+
+_snapshots: Dict[Tuple[str, Hashable], State] = {}
+_lock = threading.Lock()
+
+
+def captured(driver: WebDriver) -> State:
+    url, local_storage, session_storage = driver.execute_script(_CAPTURE_SCRIPT)
+    return State(url, driver.get_cookies(), local_storage, session_storage)
+
+
+def restore(driver: WebDriver, state: State) -> None:
+    driver.get(urljoin(state.url, '/favicon.ico'))
+    driver.delete_all_cookies()
+    for cookie in state.cookies:
+        driver.add_cookie(cookie)
+    driver.execute_script(_RESTORE_SCRIPT, state.local_storage, state.session_storage)
+    handles.navigated()
+    driver.get(state.url)
+
+
+def set_up(driver: WebDriver, name: str, flow: Callable[[], Any], *, key: Hashable = None) -> bool:
+    """
+    restores the state captured after the flow of the name with the same key,
+    otherwise performs the flow and captures the state after it,
+    returns whether the state was restored
+    """
+    if not enabled:
+        flow()
+        return False
+    with _lock:
+        state = _snapshots.get((name, key))
+    if state is not None:
+        restore(driver, state)
+        return True
+    flow()
+    state = captured(driver)
+    with _lock:
+        _snapshots[(name, key)] = state
+    return False
+
+
+def invalidate(*names: str) -> None:
+    """
+    forgets snapshots of the names (with any keys), or all of them if no names given
+    """
+    with _lock:
+        for name, key in list(_snapshots):
+            if not names or name in names:
+                del _snapshots[(name, key)]
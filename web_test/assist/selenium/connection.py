@@ -0,0 +1,80 @@
+import threading
+from typing import Dict, Tuple
+
+import urllib3
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+
+class TunedRemoteConnection(RemoteConnection):
+    """
+    RemoteConnection with configurable connection pool, per-command timeout and retries.
+
+    Retries are applied only to failed connection attempts
+    and to idempotent commands (like GET or DELETE) answered with 502/503/504,
+    because retrying e.g. a click that was already received by the server might click twice.
+
+    The tuning is applied to each connection manager, i.e. to the pool kept for all commands if keep_alive,
+    otherwise to the manager built for each command.
+
+    If shared between drivers (see `shared` below), it keeps its pooled connections alive on driver.quit()
+    """
+
+    def __init__(
+            self,
+            remote_server_addr: str,
+            *,
+            pool_size: int = 10,
+            keep_alive: bool = True,
+            command_timeout: float = 120,
+            connect_timeout: float = 10,
+            retries: int = 3,
+            retry_backoff: float = 0.5,
+            keep_pool_on_close: bool = False,
+    ):
+        self._pool_size = pool_size
+        self._command_timeout = command_timeout
+        self._connect_timeout = connect_timeout
+        self._retries = retries
+        self._retry_backoff = retry_backoff
+        self._keep_pool_on_close = keep_pool_on_close
+        super().__init__(remote_server_addr, keep_alive=keep_alive)
+
+    def _get_connection_manager(self):
+        manager = super()._get_connection_manager()
+        # tuning the pools the same way for direct and proxied connections
+        manager.connection_pool_kw.update(
+            maxsize=self._pool_size,
+            block=False,
+            timeout=urllib3.Timeout(connect=self._connect_timeout, read=self._command_timeout),
+            retries=urllib3.Retry(
+                total=self._retries,
+                connect=self._retries,
+                read=0,
+                status=self._retries,
+                status_forcelist=(502, 503, 504),
+                backoff_factor=self._retry_backoff,
+                raise_on_status=False,
+                redirect=False,
+            ),
+        )
+        return manager
+
+    def close(self):
+        if not self._keep_pool_on_close:
+            super().close()
+
+
+_shared: Dict[Tuple, TunedRemoteConnection] = {}
+_shared_lock = threading.Lock()
+
+
+def shared(remote_server_addr: str, **tuning) -> TunedRemoteConnection:
+    """
+    returns the same connection for the same remote url and tuning,
+    so all drivers in the process reuse the same pool of kept alive connections
+    """
+    key = (remote_server_addr, *sorted(tuning.items()))
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = TunedRemoteConnection(remote_server_addr, keep_pool_on_close=True, **tuning)
+        return _shared[key]
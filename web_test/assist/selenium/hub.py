@@ -0,0 +1,434 @@
+"""
+A local lightweight WebDriver hub, a drop-in stand-in for Selenoid
+when tests should run via the remote_url path but without Docker.
+
+It speaks the W3C WebDriver HTTP protocol and multiplexes sessions
+of `webdriver.Remote` onto locally spawned chromedriver/geckodriver processes:
+- new sessions wait in a FIFO queue while the concurrency limit is reached
+- idle sessions are reaped after the idle timeout (like Selenoid's -timeout)
+- driver processes are reused between sessions
+  and can be pre-spawned to not wait for their start on new session
+
+To start it::
+
+    python -m web_test.assist.selenium.hub --port 4444 --limit 4 --prespawn chrome=2
+
+and then run tests against it::
+
+    ./run/tests_remote_on.sh http://127.0.0.1:4444/wd/hub
+"""
+import argparse
+import collections
+import http.client
+import json
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+Response = Tuple[int, bytes]
+
+W3C_CAPABILITIES = {
+    'browserName',
+    'browserVersion',
+    'platformName',
+    'acceptInsecureCerts',
+    'pageLoadStrategy',
+    'proxy',
+    'setWindowRect',
+    'timeouts',
+    'strictFileInteractability',
+    'unhandledPromptBehavior',
+    'webSocketUrl',
+}
+
+
+def _chromedriver() -> str:
+    from config import settings
+
+    if settings.chromedriver_path:
+        return settings.chromedriver_path
+    if shutil.which('chromedriver'):
+        return shutil.which('chromedriver')
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return ChromeDriverManager().install()
+
+
+def _geckodriver() -> str:
+    if shutil.which('geckodriver'):
+        return shutil.which('geckodriver')
+    from webdriver_manager.firefox import GeckoDriverManager
+
+    return GeckoDriverManager().install()
+
+
+executables: Dict[str, Callable[[], str]] = {
+    'chrome': _chromedriver,
+    'chromium': _chromedriver,
+    'firefox': _geckodriver,
+}
+"""
+how to find a driver executable per browser name
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _error(status: int, error: str, message: str) -> Response:
+    return status, json.dumps({'value': {'error': error, 'message': message, 'stacktrace': ''}}).encode()
+
+
+def _w3c_only(capabilities: dict) -> dict:
+    """
+    leaves only W3C and extension (vendor:name) capabilities,
+    because Selenoid-specific ones, like enableVNC, are rejected by drivers
+    """
+    return {name: value for name, value in capabilities.items() if name in W3C_CAPABILITIES or ':' in name}
+
+
+class DriverProcess:
+    def __init__(self, browser_name: str, executable: str, start_timeout: float = 20):
+        self.browser_name = browser_name
+        self.port = _free_port()
+        self._process = subprocess.Popen(
+            [executable, f'--port={self.port}'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self._wait_ready(start_timeout)
+
+    def _wait_ready(self, timeout: float):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f'{self.browser_name} driver exited with code {self._process.returncode}')
+            try:
+                status, _ = self.request('GET', '/status')
+                if status == 200:
+                    return
+            except OSError:
+                pass
+            time.sleep(0.05)
+        self.stop()
+        raise TimeoutError(f'{self.browser_name} driver did not start in {timeout}s')
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None, timeout: float = 300) -> Response:
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=timeout)
+        try:
+            connection.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            return response.status, response.read()
+        finally:
+            connection.close()
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process.poll() is None
+
+    def stop(self):
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+
+
+class DriverPool:
+    """
+    Keeps idle driver processes per browser name to be reused by new sessions
+    """
+
+    def __init__(self, prespawned: Dict[str, int]):
+        self.prespawned = prespawned
+        self._idle: Dict[str, List[DriverProcess]] = collections.defaultdict(list)
+        self._lock = threading.Lock()
+        for browser_name in prespawned:
+            self._refill(browser_name)
+
+    def _spawn(self, browser_name: str) -> DriverProcess:
+        if browser_name not in executables:
+            raise ValueError(f'Unsupported browser: {browser_name}')
+        return DriverProcess(browser_name, executables[browser_name]())
+
+    def _refill(self, browser_name: str):
+        with self._lock:
+            missing = self.prespawned.get(browser_name, 0) - len(self._idle[browser_name])
+        for _ in range(missing):
+            process = self._spawn(browser_name)
+            with self._lock:
+                self._idle[browser_name].append(process)
+
+    def acquire(self, browser_name: str) -> DriverProcess:
+        with self._lock:
+            idle = self._idle[browser_name]
+            while idle and not idle[-1].is_alive:
+                idle.pop()
+            process = idle.pop() if idle else None
+        if browser_name in self.prespawned:
+            threading.Thread(target=self._refill, args=(browser_name,), daemon=True).start()
+        return process or self._spawn(browser_name)
+
+    def release(self, process: DriverProcess):
+        if not process.is_alive:
+            return
+        with self._lock:
+            self._idle[process.browser_name].append(process)
+
+    def stop(self):
+        with self._lock:
+            processes = [process for idle in self._idle.values() for process in idle]
+            self._idle.clear()
+        for process in processes:
+            process.stop()
+
+
+class SessionQueue:
+    """
+    Lets in not more than `limit` sessions at once, others wait in FIFO order
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiting: Deque[object] = collections.deque()
+        self._condition = threading.Condition()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    def enter(self, timeout: float) -> bool:
+        ticket = object()
+        with self._condition:
+            self._waiting.append(ticket)
+            entered = self._condition.wait_for(
+                lambda: self._waiting[0] is ticket and self.active < self.limit,
+                timeout=timeout,
+            )
+            self._waiting.remove(ticket)
+            if entered:
+                self.active += 1
+            self._condition.notify_all()
+            return entered
+
+    def leave(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+
+class _Session:
+    def __init__(self, process: DriverProcess):
+        self.process = process
+        self.last_used = time.monotonic()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: 'Hub'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def do_DELETE(self):
+        self._handle()
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else None
+        path = self.path.removeprefix('/wd/hub') or '/'
+        parts = path.strip('/').split('/')
+
+        if path == '/status':
+            status, response = 200, json.dumps({'value': self.server.status()}).encode()
+        elif parts == ['session'] and self.command == 'POST':
+            status, response = self.server.new_session(json.loads(body or b'{}'))
+        elif parts[0] == 'session' and len(parts) > 1:
+            status, response = self.server.forward(parts[1], self.command, path, body)
+        else:
+            status, response = _error(404, 'unknown command', f'{self.command} {path}')
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Hub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+            self,
+            address: Tuple[str, int] = ('127.0.0.1', 4444),
+            limit: int = 4,
+            prespawned: Optional[Dict[str, int]] = None,
+            idle_timeout: float = 120,
+            queue_timeout: float = 300,
+    ):
+        """
+        Args:
+            address (): host and port to listen on
+            limit (): max number of sessions at once, like Selenoid's -limit
+            prespawned (): number of driver processes to keep ready per browser name
+            idle_timeout (): seconds without commands after which a session is deleted
+            queue_timeout (): seconds for a new session to wait in the queue before failing
+        """
+        super().__init__(address, _Handler)
+        self.queue = SessionQueue(limit)
+        self.pool = DriverPool(prespawned or {})
+        self.idle_timeout = idle_timeout
+        self.queue_timeout = queue_timeout
+        self._sessions: Dict[str, _Session] = {}
+        self._sessions_lock = threading.Lock()
+        self._reaping = threading.Event()
+        threading.Thread(target=self._reap_idle_sessions, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/wd/hub'
+
+    def status(self) -> dict:
+        return {
+            'ready': True,
+            'message': 'local hub',
+            'limit': self.queue.limit,
+            'active': self.queue.active,
+            'queued': self.queue.waiting,
+        }
+
+    def new_session(self, payload: dict) -> Response:
+        capabilities = payload.get('capabilities', {})
+        always_match = _w3c_only(capabilities.get('alwaysMatch', {}))
+        first_match = [_w3c_only(each) for each in capabilities.get('firstMatch', [{}])]
+        browser_name = always_match.get('browserName') or first_match[0].get('browserName') or 'chrome'
+
+        if not self.queue.enter(timeout=self.queue_timeout):
+            return _error(500, 'session not created', f'Waited in queue more than {self.queue_timeout}s')
+        try:
+            process = self.pool.acquire(browser_name)
+        except Exception as error:
+            self.queue.leave()
+            return _error(500, 'session not created', str(error))
+
+        try:
+            status, response = process.request(
+                'POST',
+                '/session',
+                json.dumps({'capabilities': {'alwaysMatch': always_match, 'firstMatch': first_match}}).encode(),
+            )
+            if status != 200:
+                self.pool.release(process)
+                self.queue.leave()
+                return status, response
+
+            session_id = json.loads(response)['value']['sessionId']
+        except Exception as error:
+            # the slot and the process should not be leaked whatever the driver responded
+            self.pool.release(process)
+            self.queue.leave()
+            return _error(500, 'session not created', str(error))
+        with self._sessions_lock:
+            self._sessions[session_id] = _Session(process)
+        return status, response
+
+    def forward(self, session_id: str, method: str, path: str, body: Optional[bytes]) -> Response:
+        with self._sessions_lock:
+            session = self._sessions.get(session_id)
+        if session is None:
+            return _error(404, 'invalid session id', f'Unknown session {session_id}')
+
+        session.last_used = time.monotonic()
+        if method == 'DELETE' and path.rstrip('/') == f'/session/{session_id}':
+            return self.end_session(session_id)
+        try:
+            return session.process.request(method, path, body)
+        except OSError as error:
+            return _error(500, 'unknown error', str(error))
+
+    def end_session(self, session_id: str) -> Response:
+        with self._sessions_lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return _error(404, 'invalid session id', f'Unknown session {session_id}')
+        try:
+            return session.process.request('DELETE', f'/session/{session_id}')
+        except OSError as error:
+            return _error(500, 'unknown error', str(error))
+        finally:
+            self.pool.release(session.process)
+            self.queue.leave()
+
+    def _reap_idle_sessions(self):
+        while not self._reaping.wait(timeout=min(self.idle_timeout / 2, 10)):
+            now = time.monotonic()
+            with self._sessions_lock:
+                idle = [
+                    session_id for session_id, session in self._sessions.items()
+                    if now - session.last_used > self.idle_timeout
+                ]
+            for session_id in idle:
+                self.end_session(session_id)
+
+    def server_close(self):
+        self._reaping.set()
+        with self._sessions_lock:
+            session_ids = list(self._sessions)
+        for session_id in session_ids:
+            self.end_session(session_id)
+        self.pool.stop()
+        super().server_close()
+
+
+def main(args: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Local WebDriver hub')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=4444)
+    parser.add_argument('--limit', type=int, default=4)
+    parser.add_argument(
+        '--prespawn',
+        action='append',
+        default=[],
+        metavar='BROWSER=COUNT',
+        help='number of driver processes to keep ready, e.g. chrome=2',
+    )
+    parser.add_argument('--idle-timeout', type=float, default=120)
+    parser.add_argument('--queue-timeout', type=float, default=300)
+    options = parser.parse_args(args)
+
+    hub = Hub(
+        (options.host, options.port),
+        limit=options.limit,
+        prespawned={
+            browser_name: int(count)
+            for browser_name, count in (each.split('=') for each in options.prespawn)
+        },
+        idle_timeout=options.idle_timeout,
+        queue_timeout=options.queue_timeout,
+    )
+    print(f'Local hub is listening on {hub.url}')
+    try:
+        hub.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        hub.server_close()
+
+
+if __name__ == '__main__':
+    main()
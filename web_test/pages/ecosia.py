@@ -7,7 +7,8 @@ like Results class below
 
 from web_test.assist.allure.report import step
 from selene import by, have
-from selene.support.shared import browser
+from web_test.assist.selene.context import browser
+from web_test.assist.selene.fusion import fused
 
 """
 Instead of "class with methods + object" below
@@ -50,7 +51,7 @@ class Ecosia:
 
     @step
     def search(self, text):
-        browser.element(by.name('q')).type(text).press_enter()
+        fused(browser.element(by.name('q'))).type(text).press_enter()
 
     @property
     def results(self) -> Results:
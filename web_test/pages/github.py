@@ -1,5 +1,5 @@
 from selene import have
-from selene.support.shared import browser
+from web_test.assist.selene.context import browser
 
 from web_test.assist.allure.report import step
 
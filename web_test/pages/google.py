@@ -9,7 +9,8 @@ like Results class below
 
 
 from selene import by, have
-from selene.support.shared import browser
+from web_test.assist.selene.context import browser
+from web_test.assist.selene.fusion import fused
 
 
 class Google:
@@ -32,7 +33,7 @@ class Google:
 
     @step
     def search(self, text) -> Google:
-        browser.element(by.name('q')).type(text).press_enter()
+        fused(browser.element(by.name('q'))).type(text).press_enter()
         return self
 
     @step
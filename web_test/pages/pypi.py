@@ -1,4 +1,4 @@
-from selene.support.shared import browser
+from web_test.assist.selene.context import browser
 
 url = 'https://pypi.org/'
 
@@ -1,5 +1,6 @@
 from selene import have
-from selene.support.shared import browser
+from web_test.assist.selene.context import browser
+from web_test.assist.selene.fusion import fused
 from web_test.assist.allure.report import step
 
 """
@@ -24,7 +25,7 @@ def should_be_opened():
 
 @step
 def search(text):
-    browser.element('#id-search-field').type(text).press_enter()
+    fused(browser.element('#id-search-field')).type(text).press_enter()
 
 
 @step
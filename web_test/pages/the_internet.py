@@ -2,10 +2,16 @@ import typing
 from functools import cached_property
 
 import allure
-from selene import browser, Element, have, query, be, by
+from allure_commons.utils import represent
+from selene import Element, have, query, be, by
+from selene.common.helpers import to_by
+from selene.core.condition import Condition
 
 from web_test.assist.allure import report
-from web_test.assist.allure.chainable_naming import ChainableNamingElement
+from web_test.assist.allure.chainable_naming import Child, Component, Components, SlottedChainableNamingElement
+from web_test.assist.selene import state
+from web_test.assist.selene.context import browser
+from web_test.assist.selene.fusion import fused
 
 CSS = str
 XPATH = str
@@ -15,17 +21,40 @@ R = typing.TypeVar("R", bound="Row")
 T = typing.TypeVar("T", bound="Table[Row]")
 
 
+_ROWS_VALUES_SCRIPT = """
+    const [rowBy, cellBys] = arguments
+    const all = (root, [how, what]) => {
+        if (how !== 'xpath') {
+            return Array.from(root.querySelectorAll(what))
+        }
+        const found = document.evaluate(what, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null)
+        return Array.from({length: found.snapshotLength}, (_, index) => found.snapshotItem(index))
+    }
+    return all(element, rowBy).map(row => Object.fromEntries(
+        Object.entries(cellBys).map(([name, cellBy]) => {
+            const [cell] = all(row, cellBy)
+            return [name, cell ? cell.innerText.trim() : null]
+        })
+    ))
+"""
+
+
 def uglify_class_name(class_name: str) -> str:
     """ To better show this approach, we need to make locators more production-like. """
     return f'.//*[contains(@class,"MakeThisXPATHMoreRealisticWithSomeFrontendGarbage")' \
            f' or contains(@class,"{class_name}")]'
 
 
-class BaseElement(ChainableNamingElement):
+class BaseElement(SlottedChainableNamingElement):
     """
     This is the Base Element for described elements approach.
+
+    Subclasses that are created in bulk (like rows) may declare their attributes in __slots__,
+    others will just get a __dict__ and link their children on assignment.
     """
 
+    __slots__ = ()
+
     def __str__(self):
         return self.description or self.__class__.__name__
 
@@ -39,20 +68,20 @@ class Modal(BaseElement):
     section_locator = uglify_class_name('modal-body')
     footer_locator = uglify_class_name('modal-footer')
 
-    def __init__(self):
-        super().__init__()
-        self._container = browser.element(self.container_locator)
-        self.header: Element = self._container.element(self.header_locator)
-        self.section: Element = self._container.element(self.section_locator)
-        self.footer = self._container.element(self.footer_locator)
-        self.close_button: Element = self.footer.element('p')
+    _container = Component(container_locator)
+    header = Component(header_locator, of='_container')
+    section = Component(section_locator, of='_container')
+    footer = Component(footer_locator, of='_container')
+    close_button = Component('p', of='footer')
 
     @report.step
     def close(self):
-        self.close_button.should(be.enabled).click()
+        fused(self.close_button).should(be.enabled).click()
 
 
 class Row(BaseElement):
+    __slots__ = ("cell_locators", "_container", "_values", "body")
+
     def __init__(self, root: Element, cell_locators: typing.Dict[str, CSS_or_XPATH]):
         """
 
@@ -87,6 +116,8 @@ class Row(BaseElement):
 
 
 class RowWithActions(Row):
+    __slots__ = ("edit_button", "delete_button")
+
     def __init__(self, root: Element, cell_locators: typing.OrderedDict):
         super().__init__(root, cell_locators)
         self.edit_button: Element = self._container.element(by.text("edit"))
@@ -94,6 +125,11 @@ class RowWithActions(Row):
 
 
 class Table(BaseElement, typing.Generic[R]):
+    body = Component(lambda table: table._table_body_locator, of='_container')
+    rows = Components(lambda table: table._row_locator, of='body')
+    header = Component(lambda table: table._table_header_locator, of='_container')
+    header_cells = Components(lambda table: table._header_cell_locator, of='header')
+
     def __init__(
             self,
             root: Element,
@@ -120,10 +156,10 @@ class Table(BaseElement, typing.Generic[R]):
 
         self._container = root
         self._cell_locators = locators_dict
-        self.body = self._container.element(table_body_locator)
-        self.rows = self.body.all(row_locator)
-        self.header = self._container.element(table_header_locator)
-        self.header_cells = self.header.all(header_cell_locator)
+        self._table_body_locator = table_body_locator
+        self._row_locator = row_locator
+        self._table_header_locator = table_header_locator
+        self._header_cell_locator = header_cell_locator
         self.row_type: typing.Type[R] = row_type
 
     def get_row_count(self) -> int:
@@ -154,6 +190,27 @@ class Table(BaseElement, typing.Generic[R]):
             .set_previous_name_chain_element(self)
         )
 
+    @report.step
+    def should_have_rows(self, expected_rows_values: typing.List[dict]):
+        """
+        Checks all rows at once: each of the expected rows values should be a part of some row in the table.
+        Values of all rows are extracted by one script per each waiting attempt,
+        and all missing rows are reported together.
+        """
+        row_by = to_by(self._row_locator)
+        cell_bys = {column_name: to_by(locator) for column_name, locator in self.cell_locators.items()}
+
+        def match(table_body: Element):
+            presented = table_body.execute_script(_ROWS_VALUES_SCRIPT, row_by, cell_bys)
+            missing = [
+                expected for expected in expected_rows_values
+                if not any(expected.items() <= row_values.items() for row_values in presented)
+            ]
+            if missing:
+                raise AssertionError(f"Rows don't match!\n missing: {missing}\n presented: {presented}")
+
+        self.body.should(Condition(f'have rows with {expected_rows_values}', match))
+
     @report.step
     def is_row_presented(self, column_name, value_to_search) -> bool:
         result = self.rows.by_their(self.cell_locators[column_name], have.text(value_to_search))
@@ -198,7 +255,6 @@ class StandardCellsTable(Table[R]):
         )
         self.column_names = column_names
         self._body_cell_locator = body_cell_locator
-        self._header_cell_locator = header_cell_locator
 
     @cached_property
     @report.step(title_or_callable='preparing cell locators for a table')
@@ -225,11 +281,13 @@ class StandardCellsTable(Table[R]):
         )
 
 
-class BasePage(ChainableNamingElement):
+class BasePage(SlottedChainableNamingElement):
     """
     This is the Base Page for described elements approach
     """
 
+    __slots__ = ("url",)
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -242,28 +300,50 @@ class BasePage(ChainableNamingElement):
         browser.open(self.url)
         return self
 
+    def open_after(
+        self,
+        name: str,
+        set_up: typing.Callable[[typing.Self], typing.Any],
+        key: typing.Hashable = None,
+    ) -> typing.Self:
+        """
+        opens the page and sets it up by the flow named by name,
+        or restores the browser state captured after it with the same key in this process,
+        see web_test.assist.selene.state
+        """
+        # titled explicitly, because the set_up function rendered by report.step would put its address in the title
+        params = {'name': represent(name), 'key': represent(key)}
+        title = f' {self.get_full_path()}: open after {params["name"]}'
+        with report.StepContext(title + (f', key {params["key"]}' if key is not None else ''), params):
+            state.set_up(browser.driver, name, lambda: set_up(self.open()), key=key)
+        return self
+
 
 class PageWithModal(BasePage):
+    modal = Child(lambda page: Modal())
+
     def __init__(self):
         super().__init__(url='https://the-internet.herokuapp.com/entry_ad')
-        self.modal = Modal()
 
 
 class PageWithTables(BasePage):
+    table_one = Child(lambda page: StandardCellsTable(
+        root=browser.element('#table1'),
+        column_names=("Last Name", "First Name", "Email", "Due", "Web Site", "Action"),
+    ))
+
+    # imagine our cells have inconsistent locators, so we have to define them manually
+    table_two = Child(lambda page: Table(
+        root=browser.element('#table2'),
+        locators_dict={
+            "Last Name": ".//td[1]",
+            "First Name": ".//td[2]",
+            "Email": ".//td[3]",
+            "Due": ".//td[4]",
+            "Web Site": ".//td[5]",
+            "Action": ".//td[6]"},
+        row_type=RowWithActions,
+    ))
+
     def __init__(self):
         super().__init__('https://the-internet.herokuapp.com/tables')
-        self.table_one: StandardCellsTable[Row] = StandardCellsTable(root=browser.element('#table1'),
-                                                                     column_names=(
-                                                                         "Last Name", "First Name", "Email", "Due",
-                                                                         "Web Site", "Action"))
-
-        # imagine our cells have inconsistent locators, so we have to define them manually
-        self.table_two: Table[RowWithActions] = Table(root=browser.element('#table2'),
-                                                      locators_dict={
-                                                          "Last Name": ".//td[1]",
-                                                          "First Name": ".//td[2]",
-                                                          "Email": ".//td[3]",
-                                                          "Due": ".//td[4]",
-                                                          "Web Site": ".//td[5]",
-                                                          "Action": ".//td[6]"},
-                                                      row_type=RowWithActions)
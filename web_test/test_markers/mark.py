@@ -11,35 +11,36 @@ Additional Resources:
 - https://docs.qameta.io/allure/#_pytest
   - https://docs.qameta.io/allure/#_tags
 - https://docs.pytest.org/en/latest/example/markers.html
-- https://github.com/pytest-dev/pytest-rerunfailures
 """
 
 import pytest
 import allure
+from allure_commons.types import LabelType
 import functools
 
 
-def pending(test_fn):                                                           # todo: consider impl as pytest fixture
-    def decorated(*args, **kwargs):
-        test_fn(*args, **kwargs)
-        pytest.skip('as pending')
-    return decorated
+def pending(test_fn):
+    """
+    skips the test before any of its fixtures is set up,
+    tests with empty bodies are also skipped as pending automatically,
+    see pytest_collection_modifyitems in conftest.py
+    """
+    return pytest.mark.skip(reason='as pending')(allure.tag('pending')(test_fn))
 
 
 import functools
 
 
-@functools.wraps(pytest.mark.flaky)
 def flaky(func=..., *, reruns: int = 0, reruns_delay: int = 0, condition=True):
     """
-    alias to pytest.mark.flaky(reruns, reruns_delay)
-    from pytest-rerunfailures plugin
-    (no need to mention in pytest.ini)
+    marks the test to be rerun on failure up to `reruns` times,
+    at the end of the session, after `reruns_delay` seconds,
+    if condition is true and the suite-wide rerun budget is not exhausted
+    (see web_test.assist.reruns for more details)
     """
 
-    @functools.wraps(pytest.mark.flaky)
     def allurish_decorator(func_):
-        return pytest.mark.flaky(
+        return pytest.mark.rerun(
             reruns=reruns,
             reruns_delay=reruns_delay,
             condition=condition,
@@ -48,6 +49,25 @@ def flaky(func=..., *, reruns: int = 0, reruns_delay: int = 0, condition=True):
     return allurish_decorator(func) if callable(func) else allurish_decorator
 
 
+def deadline(seconds: float):
+    """
+    limits the time of the test to `seconds` since its setup started,
+    instead of config.settings.deadline_test_seconds,
+    its waits are shortened to what is left, and fail fast once nothing is left
+    (see web_test.assist.deadlines for more details)
+    """
+    return pytest.mark.deadline(seconds)
+
+
+benchmark_module = [pytest.mark.benchmark, pytest.mark.allure_label('benchmark', label_type=LabelType.TAG)]
+"""
+marks all tests of a module as benchmarks via `pytestmark = mark.benchmark_module`,
+because tag.benchmark, assigned to pytestmark, would add only the pytest marker, without the allure tag;
+the tag is marked the same way allure.tag does, but directly,
+because allure.tag called on import of this module, before allure-pytest is registered, returns no mark
+"""
+
+
 class suite:
     @staticmethod
     @functools.wraps(pytest.mark.smoke)
@@ -65,3 +85,8 @@ class tag:
     @functools.wraps(pytest.mark.fast)
     def fast(func):
         return pytest.mark.fast(allure.tag('fast')(func))
+
+    @staticmethod
+    @functools.wraps(pytest.mark.benchmark)
+    def benchmark(func):
+        return pytest.mark.benchmark(allure.tag('benchmark')(func))